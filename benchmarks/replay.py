@@ -0,0 +1,158 @@
+import asyncio
+import copy
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from travel_planner import http_client
+from travel_planner.geocoding import geocoder
+from travel_planner.search_cache import search_cache
+from travel_planner.weather_cache import forecast_cache
+
+# --- Recorded Upstream Replay ---
+# Open-Meteo, Overpass and Nominatim are replaced by recorded responses served
+# with a configurable delay, so benchmarks need no network and time the
+# project's own code plus a fixed, known upstream latency.
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+# The Overpass fixture was captured around this place; replayed responses
+# are shifted to whatever centre the query asks for.
+OVERPASS_RECORDED_AT = "paris"
+
+_AROUND = re.compile(r"around:(\d+),(-?[\d.]+),(-?[\d.]+)")
+
+
+def load_fixture(name: str) -> Any:
+    with open(FIXTURES_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass
+class Latency:
+    """Injected upstream delays in seconds."""
+
+    http: float = 0.02
+    geocode: float = 0.05
+
+
+@dataclass
+class UpstreamCounters:
+    requests: Dict[str, int] = field(default_factory=dict)
+    geocodes: int = 0
+
+    def count(self, host: str) -> None:
+        self.requests[host] = self.requests.get(host, 0) + 1
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport answering Open-Meteo and Overpass requests from fixtures.
+    Unknown hosts get a 404 so a new upstream shows up as an error.
+    """
+
+    def __init__(self, latency: Latency, counters: UpstreamCounters):
+        self.latency = latency
+        self.counters = counters
+        self.forecast = load_fixture("open_meteo.json")
+        self.places = load_fixture("overpass.json")
+        lat, lon, _ = load_fixture("geocode.json")[OVERPASS_RECORDED_AT]
+        self.places_origin = (lat, lon)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.counters.count(host)
+        if self.latency.http:
+            await asyncio.sleep(self.latency.http)
+        if host == "api.open-meteo.com":
+            return httpx.Response(200, json=self._forecasts(request.url.params))
+        if host == "overpass-api.de":
+            return httpx.Response(200, json=self._overpass(request.url.params))
+        return httpx.Response(404, json={"error": f"no fixture for {host}"})
+
+    def _forecast_for(self, lat: float, lon: float, days: int) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.forecast)
+        payload["latitude"], payload["longitude"] = lat, lon
+        # Roll the recorded dates forward so they start at the local today.
+        offset = timedelta(seconds=payload.get("utc_offset_seconds") or 0)
+        today = (datetime.now(timezone.utc) + offset).date()
+        daily = payload["daily"]
+        for key, values in daily.items():
+            daily[key] = values[:days]
+        daily["time"] = [
+            (today + timedelta(days=i)).isoformat() for i in range(len(daily["time"]))
+        ]
+        return payload
+
+    def _forecasts(self, params: httpx.QueryParams) -> Any:
+        lats = [float(v) for v in params.get("latitude", "0").split(",")]
+        lons = [float(v) for v in params.get("longitude", "0").split(",")]
+        days = int(params.get("forecast_days", 7))
+        payloads = [self._forecast_for(a, b, days) for a, b in zip(lats, lons)]
+        # Open-Meteo returns a list only for multi-location requests.
+        return payloads if len(payloads) > 1 else payloads[0]
+
+    def _overpass(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        match = _AROUND.search(params.get("data", ""))
+        if match is None:
+            return {"elements": []}
+        lat, lon = float(match.group(2)), float(match.group(3))
+        dlat = lat - self.places_origin[0]
+        dlon = lon - self.places_origin[1]
+        payload = dict(self.places)
+        payload["elements"] = [
+            dict(el, lat=el["lat"] + dlat, lon=el["lon"] + dlon)
+            for el in self.places["elements"]
+        ]
+        return payload
+
+
+@dataclass(frozen=True)
+class _Location:
+    latitude: float
+    longitude: float
+    address: str
+
+
+class ReplayGeocoder:
+    """Stand-in for Nominatim: fixture lookups with a blocking delay."""
+
+    def __init__(self, latency: Latency, counters: UpstreamCounters):
+        self.latency = latency
+        self.counters = counters
+        self.places = load_fixture("geocode.json")
+        self._lock = threading.Lock()
+
+    def __call__(self, location: str) -> Optional[_Location]:
+        with self._lock:
+            self.counters.geocodes += 1
+        if self.latency.geocode:
+            time.sleep(self.latency.geocode)
+        found = self.places.get(location.strip().casefold())
+        return _Location(*found) if found else None
+
+
+def fixture_cities() -> List[str]:
+    return list(load_fixture("geocode.json"))
+
+
+def install(latency: Latency) -> UpstreamCounters:
+    """Route all upstream traffic to the fixtures; returns live counters."""
+    counters = UpstreamCounters()
+    http_client.configure(transport=ReplayTransport(latency, counters))
+    geocoder.store = None
+    geocoder._geocode_fn = ReplayGeocoder(latency, counters)
+    return counters
+
+
+def reset_caches() -> None:
+    """Drop every in-process cache so a run starts cold."""
+    geocoder.cache.clear()
+    forecast_cache.clear()
+    search_cache.clear()
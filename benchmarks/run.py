@@ -0,0 +1,410 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from benchmarks.replay import Latency, fixture_cities, install, reset_caches
+from benchmarks.stub_llm import Script, ScriptedLlm, restore_models, use_model
+from travel_planner.agent import root_agent
+from travel_planner.context import context_assembler
+from travel_planner.streaming import ResponseStreamer
+from travel_planner.tools import (
+    find_nearby_places_open_async,
+    get_weather_forecast_async,
+)
+
+# --- Offline Benchmarks ---
+# Replays recorded upstream responses and a scripted model through the real
+# agent tree, then reports throughput and latency percentiles per scenario.
+#
+#   python -m benchmarks.run --sessions 20 --iterations 5
+#   python -m benchmarks.run --output new.json --baseline main.json
+#   python -m benchmarks.run --stream   # agent scenarios via the streaming API
+#
+# With --baseline the run fails (exit 1) when any scenario's p95 latency or
+# throughput regresses by more than --max-regression.
+
+APP_NAME = "travel_planner_bench"
+
+
+@dataclass
+class Scenario:
+    name: str
+    message: str  # user message; {city} is filled per request
+    script: Script = field(default_factory=dict)
+    # Set for tool-only scenarios, which skip the agent tree entirely.
+    tool: Optional[Callable[[str], Awaitable[str]]] = None
+
+
+_TO_INSPIRATION = [("transfer_to_agent", {"agent_name": "travel_inspiration_agent"})]
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario(
+            "weather_tool",
+            "{city}",
+            tool=lambda city: get_weather_forecast_async(city, days=3),
+        ),
+        Scenario(
+            "places_tool",
+            "{city}",
+            tool=lambda city: find_nearby_places_open_async("restaurant", city),
+        ),
+        Scenario(
+            "weather",
+            "What's the weather in {city} for the next 3 days?",
+            {
+                "travel_planner_main": _TO_INSPIRATION,
+                "travel_inspiration_agent": [
+                    ("weather_agent", {"request": "3-day forecast for {city}"})
+                ],
+                "weather_agent": [
+                    ("get_weather_forecast_async", {"location": "{city}", "days": 3})
+                ],
+            },
+        ),
+        Scenario(
+            "places",
+            "Find me good restaurants in {city}",
+            {
+                "travel_planner_main": _TO_INSPIRATION,
+                "travel_inspiration_agent": [
+                    ("places_agent", {"request": "restaurants in {city}"})
+                ],
+                "places_agent": [
+                    (
+                        "find_nearby_places_open_async",
+                        {"query": "restaurant", "location": "{city}"},
+                    )
+                ],
+            },
+        ),
+        Scenario(
+            "itinerary",
+            "Plan a 4-day trip to {city} for two people, US passports.",
+            {
+                "travel_planner_main": _TO_INSPIRATION,
+                "travel_inspiration_agent": [
+                    (
+                        "plan_trip_in_parallel",
+                        {
+                            "news_request": "Travel news and festivals in {city}",
+                            "places_request": "Top restaurants in {city}",
+                            "weather_request": "4-day forecast for {city}",
+                            "budget_request": "4 days in {city} for 2 travelers",
+                            "visa_request": "US citizens visiting {city}",
+                        },
+                    )
+                ],
+                "news_agent": [
+                    ("google_search_wrapped_agent", {"request": "{city} travel news"})
+                ],
+                "places_agent": [
+                    (
+                        "find_nearby_places_open_async",
+                        {"query": "restaurant", "location": "{city}"},
+                    )
+                ],
+                "weather_agent": [
+                    ("get_weather_forecast_async", {"location": "{city}", "days": 4})
+                ],
+                "budget_agent": [
+                    (
+                        "calculate_budget",
+                        {
+                            "user_id": "bench",
+                            "destination": "{city}",
+                            "days": 4,
+                            "travelers": 2,
+                        },
+                    )
+                ],
+                "visa_agent": [
+                    (
+                        "check_visa_requirement",
+                        {"nationality": "US", "destination": "{city}"},
+                    )
+                ],
+            },
+        ),
+    )
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+@dataclass
+class Result:
+    scenario: str
+    sessions: int
+    requests: int
+    errors: int
+    wall_seconds: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    llm_calls: int
+    upstream_requests: Dict[str, int]
+    geocodes: int
+    # Time until the client has something to show: the first streamed
+    # result with --stream, otherwise the whole answer.
+    first_result_p50_ms: float = math.nan
+    first_result_p95_ms: float = math.nan
+
+
+async def _run_session(
+    scenario: Scenario,
+    runner: Optional[InMemoryRunner],
+    session_no: int,
+    iterations: int,
+    cities: List[str],
+    latencies: List[float],
+    first_results: List[float],
+    stream: bool = False,
+) -> int:
+    errors = 0
+    user_id = f"bench-user-{session_no}"
+    session_id = None
+    if runner is not None:
+        session = await runner.session_service.create_session(
+            app_name=APP_NAME, user_id=user_id
+        )
+        session_id = session.id
+    for i in range(iterations):
+        city = cities[(session_no + i) % len(cities)]
+        text = scenario.message.format(city=city.title())
+        started = time.perf_counter()
+        first_result = None
+        try:
+            if scenario.tool is not None:
+                answer = await scenario.tool(city)
+            elif stream:
+                answer = ""
+                streamer = ResponseStreamer(runner, app_name=APP_NAME)
+                async for event in streamer.stream(user_id, text, session_id):
+                    if event.kind in ("partial", "delta") and first_result is None:
+                        first_result = time.perf_counter() - started
+                    elif event.kind == "final":
+                        answer = event.text
+                    elif event.kind == "error":
+                        answer = event.text or "❌"
+            else:
+                message = types.Content(role="user", parts=[types.Part(text=text)])
+                answer = ""
+                async for event in runner.run_async(
+                    user_id=user_id, session_id=session_id, new_message=message
+                ):
+                    if event.is_final_response() and event.content:
+                        answer = "".join(p.text or "" for p in event.content.parts)
+            if not answer or "❌" in answer:
+                errors += 1
+            # Each turn must land in the user's history and so in the context
+            # summary the next model call sees.
+            elif scenario.tool is None and text not in context_assembler().summary(
+                user_id
+            ):
+                errors += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+        first_results.append(first_result or latencies[-1])
+    return errors
+
+
+async def run_scenario(
+    scenario: Scenario,
+    sessions: int,
+    iterations: int,
+    latency: Latency,
+    llm_latency: float,
+    warm: bool = False,
+    stream: bool = False,
+) -> Result:
+    """Run ``sessions`` concurrent sessions of ``iterations`` requests each."""
+    counters = install(latency)
+    if not warm:
+        reset_caches()
+    cities = fixture_cities()
+    model = ScriptedLlm(
+        model=str(root_agent.model),
+        script=scenario.script,
+        cities=cities,
+        latency=llm_latency,
+    )
+    previous = use_model(root_agent, model)
+    runner = (
+        InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+        if scenario.tool is None
+        else None
+    )
+    latencies: List[float] = []
+    first_results: List[float] = []
+    started = time.perf_counter()
+    try:
+        errors = await asyncio.gather(
+            *(
+                _run_session(
+                    scenario,
+                    runner,
+                    n,
+                    iterations,
+                    cities,
+                    latencies,
+                    first_results,
+                    stream,
+                )
+                for n in range(sessions)
+            )
+        )
+    finally:
+        restore_models(previous)
+    wall = time.perf_counter() - started
+    ms = [s * 1000 for s in latencies]
+    first_ms = [s * 1000 for s in first_results]
+    return Result(
+        scenario=scenario.name,
+        sessions=sessions,
+        requests=len(ms),
+        errors=sum(errors),
+        wall_seconds=round(wall, 3),
+        throughput_rps=round(len(ms) / wall, 2) if wall else 0.0,
+        p50_ms=round(percentile(ms, 50), 2),
+        p95_ms=round(percentile(ms, 95), 2),
+        p99_ms=round(percentile(ms, 99), 2),
+        mean_ms=round(sum(ms) / len(ms), 2) if ms else math.nan,
+        llm_calls=model.calls,
+        upstream_requests=dict(counters.requests),
+        geocodes=counters.geocodes,
+        first_result_p50_ms=round(percentile(first_ms, 50), 2),
+        first_result_p95_ms=round(percentile(first_ms, 95), 2),
+    )
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Any], max_regression: float
+) -> List[str]:
+    """Return a message for every scenario that regressed past the limit."""
+    failures = []
+    previous = {r["scenario"]: r for r in baseline.get("results", [])}
+    for result in results:
+        base = previous.get(result.scenario)
+        if base is None:
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + max_regression):
+            failures.append(
+                f"{result.scenario}: p95 {result.p95_ms}ms vs baseline {base['p95_ms']}ms"
+            )
+        if result.throughput_rps < base["throughput_rps"] * (1 - max_regression):
+            failures.append(
+                f"{result.scenario}: throughput {result.throughput_rps} req/s "
+                f"vs baseline {base['throughput_rps']} req/s"
+            )
+        if result.errors > base.get("errors", 0):
+            failures.append(
+                f"{result.scenario}: {result.errors} errors vs baseline {base['errors']}"
+            )
+    return failures
+
+
+def _print_table(results: List[Result]) -> None:
+    header = (
+        f"{'scenario':<14}{'reqs':>6}{'err':>5}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'1st p50':>10}"
+        f"{'llm':>6}{'http':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.scenario:<14}{r.requests:>6}{r.errors:>5}{r.throughput_rps:>9}"
+            f"{r.p50_ms:>10}{r.p95_ms:>10}{r.p99_ms:>10}"
+            f"{r.first_result_p50_ms:>10}{r.llm_calls:>6}"
+            f"{sum(r.upstream_requests.values()):>6}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Offline latency/throughput benchmarks for travel_planner."
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--http-latency", type=float, default=Latency.http)
+    parser.add_argument("--geocode-latency", type=float, default=Latency.geocode)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument(
+        "--warm", action="store_true", help="Keep caches between scenarios"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Run agent scenarios through the streaming API",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    latency = Latency(http=args.http_latency, geocode=args.geocode_latency)
+    results = [
+        asyncio.run(
+            run_scenario(
+                SCENARIOS[name],
+                args.sessions,
+                args.iterations,
+                latency,
+                args.llm_latency,
+                warm=args.warm,
+                stream=args.stream,
+            )
+        )
+        for name in args.scenario or SCENARIOS
+    ]
+    _print_table(results)
+    report = {
+        "config": {
+            "sessions": args.sessions,
+            "iterations": args.iterations,
+            "http_latency": args.http_latency,
+            "geocode_latency": args.geocode_latency,
+            "llm_latency": args.llm_latency,
+            "stream": args.stream,
+        },
+        "results": [asdict(r) for r in results],
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
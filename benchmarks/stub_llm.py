@@ -0,0 +1,127 @@
+import asyncio
+import re
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+# --- Deterministic Stub Model ---
+# Drives the real agent tree without Gemini. Each agent follows a fixed
+# script: on a fresh turn it emits the function calls listed for it, and once
+# its tools have answered it replies with a short text built from their
+# results. The only cost added per call is the configured latency.
+
+# agent name -> [(tool name, args)]; string args may use {city}.
+Script = Dict[str, List[Tuple[str, Dict[str, Any]]]]
+
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+
+
+def _text_of(content: types.Content) -> str:
+    return " ".join(part.text for part in content.parts or () if part.text)
+
+
+def _fill(value: Any, city: str) -> Any:
+    return value.format(city=city.title()) if isinstance(value, str) else value
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    Stub ``BaseLlm`` that plays back a per-agent script.
+    Args:
+        script (dict): Agent name -> function calls for a fresh turn.
+        cities (list): Place names recognised in user text for ``{city}``.
+        latency (float): Seconds slept per model call.
+    """
+
+    script: Script = {}
+    cities: List[str] = []
+    latency: float = 0.0
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        instruction = str(llm_request.config.system_instruction or "")
+        match = _AGENT_NAME.search(instruction)
+        agent = match.group(1) if match else ""
+        last = llm_request.contents[-1] if llm_request.contents else None
+        responses = [
+            part.function_response
+            for part in (last.parts or () if last else ())
+            if part.function_response
+        ]
+        if responses:
+            parts = [types.Part(text=self._summarize(agent, responses))]
+        elif agent in self.script:
+            city = self._city(llm_request)
+            parts = [
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name=name, args={k: _fill(v, city) for k, v in args.items()}
+                    )
+                )
+                for name, args in self.script[agent]
+            ]
+        else:
+            request = _text_of(last) if last else ""
+            parts = [types.Part(text=f"[{agent}] {request[:200]}")]
+        prompt_chars = len(instruction) + sum(
+            len(_text_of(c)) for c in llm_request.contents
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_chars // 4,
+                candidates_token_count=40,
+                total_token_count=prompt_chars // 4 + 40,
+            ),
+        )
+
+    def _city(self, llm_request: LlmRequest) -> str:
+        for content in reversed(llm_request.contents):
+            text = _text_of(content).casefold()
+            for city in self.cities:
+                if city in text:
+                    return city
+        return self.cities[0] if self.cities else ""
+
+    def _summarize(self, agent: str, responses: List[types.FunctionResponse]) -> str:
+        lines = [f"[{agent}]"]
+        for response in responses:
+            result = response.response or {}
+            lines.append(
+                f"- {response.name}: {str(result.get('result', result))[:300]}"
+            )
+        return "\n".join(lines)
+
+
+def use_model(root: BaseAgent, model: BaseLlm) -> Dict[int, Tuple[LlmAgent, Any]]:
+    """
+    Point every LlmAgent under ``root`` (sub-agents and AgentTool-wrapped
+    agents) at ``model``. Returns the previous models for ``restore_models``.
+    """
+    previous: Dict[int, Tuple[LlmAgent, Any]] = {}
+    stack = [root]
+    seen = set()
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        if isinstance(agent, LlmAgent):
+            previous[id(agent)] = (agent, agent.model)
+            agent.model = model
+            stack.extend(t.agent for t in agent.tools if isinstance(t, AgentTool))
+        stack.extend(agent.sub_agents)
+    return previous
+
+
+def restore_models(previous: Dict[int, Tuple[LlmAgent, Any]]) -> None:
+    for agent, model in previous.values():
+        agent.model = model
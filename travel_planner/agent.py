@@ -1,15 +1,23 @@
-from google.adk.agents import Agent
+from travel_planner.registry import registry
 
+LLM = "gemini-2.5-flash-lite"
 
-from travel_planner.supporting_agents import travel_inspiration_agent
 
-LLM = "gemini-2.5-flash-lite"
+def build_root_agent():
+    # Imported here so that importing this module does not load google.adk
+    # and the whole tool stack; see travel_planner.registry.
+    from google.adk.agents import Agent
 
-root_agent = Agent(
-    model=LLM,
-    name="travel_planner_main",
-    description="A modern, user-centric travel planning assistant that delivers personalized, actionable trip recommendations and insights.",
-    instruction="""
+    from travel_planner.context import inject_user_context, record_user_turn
+    from travel_planner.fast_path import fast_path_callback
+    from travel_planner.supporting_agents import travel_inspiration_agent
+    from travel_planner.tracing import instrument_agent_tree
+
+    root_agent = Agent(
+        model=LLM,
+        name="travel_planner_main",
+        description="A modern, user-centric travel planning assistant that delivers personalized, actionable trip recommendations and insights.",
+        instruction="""
         You are an expert travel concierge agent. Your mission is to help users discover, plan, and optimize their dream vacations with precision and care.
         - Always focus on the user's preferences, constraints, and travel goals.
         - Use your sub-agents to gather the best destinations, current events, and places of interest (e.g., hotels, cafes, attractions) tailored to the user.
@@ -19,5 +27,24 @@ root_agent = Agent(
         - If information is unavailable, offer alternatives or next steps.
         - You cannot use any tool directly; always delegate to sub-agents for information gathering.
     """,
-    sub_agents=[travel_inspiration_agent],
-)
+        sub_agents=[travel_inspiration_agent],
+        before_model_callback=[
+            record_user_turn,
+            fast_path_callback,
+            inject_user_context,
+        ],
+    )
+
+    instrument_agent_tree(root_agent)
+    return root_agent
+
+
+registry.register("travel_planner_main", build_root_agent)
+
+
+def __getattr__(name: str):
+    # ``root_agent`` is built on first access (ADK's loader reads it as a
+    # module attribute, so ``adk run`` / ``adk web`` work unchanged).
+    if name == "root_agent":
+        return registry.get("travel_planner_main")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
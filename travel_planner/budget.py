@@ -0,0 +1,224 @@
+import csv
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from travel_planner.geocoding import normalize_location
+from travel_planner.user_record import Budget, _coerce
+
+# --- Budget Engine ---
+# Per-destination, per-season costs come from a CSV table loaded once into a
+# (destination, season, category) NumPy array. An estimate is a row lookup
+# times per-tier multipliers times trip units, so any number of
+# (destination, days, travelers, tier, month) combinations is priced in a
+# single vectorized pass.
+
+COST_TABLE_PATH = os.environ.get(
+    "TRAVEL_COST_TABLE", str(Path(__file__).parent / "data" / "costs.csv")
+)
+
+CATEGORIES = ("flight", "hotel", "food", "transport", "activities")
+SEASONS = ("low", "shoulder", "high")
+ANY_SEASON = len(SEASONS)  # annual average, used when no month is given
+TIERS = (Budget.LOW, Budget.MID, Budget.HIGH)
+# Multipliers on the mid-range table per tier, in CATEGORIES order.
+TIER_MULTIPLIERS = np.array(
+    [
+        [0.85, 0.5, 0.6, 0.7, 0.5],
+        [1.0, 1.0, 1.0, 1.0, 1.0],
+        [2.5, 2.6, 2.2, 2.0, 2.0],
+    ]
+)
+TRAVELERS_PER_ROOM = 2
+_COLUMNS = (
+    "flight",
+    "hotel_per_night",
+    "food_per_day",
+    "transport_per_day",
+    "activities_per_day",
+)
+
+
+def tier_index(tier: Any) -> int:
+    """Position of a profile budget value in TIERS; unknown values are mid."""
+    tier = _coerce(Budget, tier)
+    return TIERS.index(tier) if tier in TIERS else TIERS.index(Budget.MID)
+
+
+@dataclass
+class BudgetEstimates:
+    """
+    Result of CostTable.estimate_many; row i answers combination i.
+    Args:
+        destinations (list): Resolved destination names.
+        found (np.ndarray): False where the destination was not in the table
+            and the global median was used instead.
+        season (np.ndarray): Season index (into SEASONS; ANY_SEASON if no month).
+        breakdown (np.ndarray): (N, len(CATEGORIES)) costs in USD.
+        total (np.ndarray): (N,) total cost in USD.
+    """
+
+    destinations: List[str]
+    found: np.ndarray
+    season: np.ndarray
+    breakdown: np.ndarray
+    total: np.ndarray
+
+
+class CostTable:
+    """
+    Cost table indexed by normalized destination (city or country) name.
+    Args:
+        names (list): Display name per destination row.
+        costs (np.ndarray): (D, len(SEASONS) + 1, len(CATEGORIES)) mid-tier
+            costs; the last season slot is the annual average.
+        month_season (np.ndarray): (D, 12) season index per calendar month.
+        aliases (dict): Normalized name -> destination row.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        costs: np.ndarray,
+        month_season: np.ndarray,
+        aliases: Dict[str, int],
+    ):
+        self.names = names
+        self.costs = costs
+        self.month_season = month_season
+        self.aliases = aliases
+        # Unknown destinations are priced at the median of every city.
+        self.fallback = len(names) - 1
+
+    @classmethod
+    def from_csv(cls, path: str) -> "CostTable":
+        """
+        Load a table with columns destination, country, season, months and
+        the per-category costs (one row per destination and season). Each
+        country also becomes a destination priced at its cities' average.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        with open(path, encoding="utf-8", newline="") as f:
+            for record in csv.DictReader(f):
+                city = rows.setdefault(
+                    record["destination"].strip(),
+                    {
+                        "country": record["country"].strip(),
+                        "costs": np.full((len(SEASONS), len(CATEGORIES)), np.nan),
+                        "months": np.full(12, SEASONS.index("shoulder"), np.int8),
+                    },
+                )
+                season = SEASONS.index(record["season"].strip().lower())
+                city["costs"][season] = [float(record[c]) for c in _COLUMNS]
+                for month in record["months"].split():
+                    city["months"][int(month) - 1] = season
+        names = list(rows)
+        seasonal = np.stack([rows[n]["costs"] for n in names])
+        # A season missing from the file falls back to the city's other rows.
+        seasonal = np.where(
+            np.isnan(seasonal), np.nanmean(seasonal, axis=1, keepdims=True), seasonal
+        )
+        months = np.stack([rows[n]["months"] for n in names])
+
+        countries: Dict[str, List[int]] = {}
+        for i, name in enumerate(names):
+            countries.setdefault(rows[name]["country"], []).append(i)
+        country_names = [c for c in countries if c not in rows]
+        seasonal = np.concatenate(
+            [
+                seasonal,
+                np.stack([seasonal[countries[c]].mean(axis=0) for c in country_names]),
+                np.median(seasonal, axis=0, keepdims=True),
+            ]
+        )
+        months = np.concatenate(
+            [
+                months,
+                np.stack([months[countries[c][0]] for c in country_names]),
+                np.full((1, 12), SEASONS.index("shoulder"), np.int8),
+            ]
+        )
+        costs = np.concatenate([seasonal, seasonal.mean(axis=1, keepdims=True)], axis=1)
+        all_names = names + country_names + ["(typical destination)"]
+        aliases = {normalize_location(n): i for i, n in enumerate(all_names[:-1])}
+        return cls(all_names, costs, months, aliases)
+
+    def lookup(self, destination: str) -> Optional[int]:
+        key = normalize_location(destination)
+        index = self.aliases.get(key)
+        if index is None and "," in key:
+            # "Kyoto, Japan" -> "kyoto", then "japan"
+            for part in key.split(","):
+                index = self.aliases.get(part.strip())
+                if index is not None:
+                    break
+        return index
+
+    def estimate_many(
+        self,
+        destinations: Sequence[str],
+        days: Any,
+        travelers: Any = 1,
+        tiers: Any = Budget.MID,
+        months: Any = None,
+    ) -> BudgetEstimates:
+        """
+        Price every combination in one pass. ``days``, ``travelers``, ``tiers``
+        and ``months`` are scalars or sequences aligned with ``destinations``;
+        tiers are Budget values or profile strings, months 1-12 (0/None =
+        unknown, priced at the annual average).
+        """
+        n = len(destinations)
+        resolved = {d: self.lookup(d) for d in set(destinations)}
+        index = [resolved[d] for d in destinations]
+        found = np.array([i is not None for i in index], dtype=bool)
+        rows = np.array([self.fallback if i is None else i for i in index], np.intp)
+        days = np.broadcast_to(np.asarray(days, dtype=float), n)
+        travelers = np.broadcast_to(np.asarray(travelers, dtype=float), n)
+        if isinstance(tiers, (str, Budget)) or tiers is None:
+            tier_rows = np.full(n, tier_index(tiers), np.intp)
+        else:
+            tier_rows = np.fromiter((tier_index(t) for t in tiers), np.intp, n)
+        if months is None:
+            months = np.zeros(n, np.intp)
+        else:
+            months = np.broadcast_to(
+                np.nan_to_num(np.asarray(months, dtype=float)).astype(np.intp), n
+            )
+        known = (months >= 1) & (months <= 12)
+        season = np.where(
+            known, self.month_season[rows, np.clip(months, 1, 12) - 1], ANY_SEASON
+        )
+
+        nights = np.maximum(days - 1, 1)
+        rooms = np.ceil(travelers / TRAVELERS_PER_ROOM)
+        person_days = days * travelers
+        units = np.stack(
+            [travelers, nights * rooms, person_days, person_days, person_days], axis=1
+        )
+        breakdown = self.costs[rows, season] * TIER_MULTIPLIERS[tier_rows] * units
+        return BudgetEstimates(
+            destinations=[self.names[r] for r in rows],
+            found=found,
+            season=season,
+            breakdown=breakdown,
+            total=breakdown.sum(axis=1),
+        )
+
+
+_table: Optional[CostTable] = None
+_table_lock = threading.Lock()
+
+
+def cost_table() -> CostTable:
+    """The shared cost table, loaded from COST_TABLE_PATH on first use."""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = CostTable.from_csv(COST_TABLE_PATH)
+    return _table
@@ -0,0 +1,250 @@
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from travel_planner.cache import TTLCache
+from travel_planner.user_record import UserRecord, _value
+
+# --- User Context Assembly ---
+# Agents personalize "from context", so each model call gets a compact
+# summary of the user's profile, preferences, recent requests and feedback
+# appended to its system instruction. Each user message is recorded in
+# history as it arrives. The summary is held to a token budget:
+# every section has a fixed share of it, which also keeps sections
+# independent, so a write re-renders only the section it touched. Summaries
+# are cached per user and stay byte-identical between writes, which keeps the
+# prompt prefix stable for model-side prompt caching.
+
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("TRAVEL_CONTEXT_TOKENS", 250))
+DEFAULT_HISTORY_ITEMS = int(os.environ.get("TRAVEL_CONTEXT_HISTORY_ITEMS", 5))
+# Writes made by other processes (shared SQLite store) are picked up after this.
+DEFAULT_TTL = float(os.environ.get("TRAVEL_CONTEXT_TTL", 300))
+DEFAULT_MAX_USERS = int(os.environ.get("TRAVEL_CONTEXT_CACHE_SIZE", 10_000))
+# Rough English average; avoids pulling a tokenizer into the request path.
+CHARS_PER_TOKEN = 4
+SECTION_SHARES = {"profile": 0.3, "preferences": 0.2, "feedback": 0.2, "history": 0.3}
+MAX_ITEM_CHARS = 120
+
+_RATING = re.compile(r"\b([0-5](?:\.\d)?)\s*(?:/\s*5|stars?)\b", re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _clip(text: Any, max_chars: int = MAX_ITEM_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
+
+
+def _fit(prefix: str, items: List[str], budget: int, sep: str = "; ") -> str:
+    """``prefix`` plus as many ``items`` as fit in ``budget`` tokens."""
+    line, kept = prefix, 0
+    for item in items:
+        candidate = line + (sep if kept else "") + item
+        if estimate_tokens(candidate) > budget:
+            break
+        line, kept = candidate, kept + 1
+    return line if kept else ""
+
+
+def _profile(record: UserRecord, budget: int) -> str:
+    profile = record.profile
+    labels = {"low": "low-cost", "mid": "mid-range", "high": "luxury"}
+    items = []
+    if profile.budget is not None:
+        items.append(f"budget {labels.get(_value(profile.budget), profile.budget)}")
+    if profile.style is not None:
+        items.append(f"style {_value(profile.style)}")
+    if profile.age_group is not None:
+        items.append(f"age {_value(profile.age_group)}")
+    if profile.activities:
+        items.append(f"interests {', '.join(profile.activities)}")
+    for key, value in (profile.extra or {}).items():
+        items.append(f"{key} {_clip(value, 40)}")
+    return _fit("- Profile: ", items, budget)
+
+
+def _preferences(record: UserRecord, budget: int) -> str:
+    items = [f"{k} {_clip(v, 40)}" for k, v in (record.preferences or {}).items()]
+    return _fit("- Preferences: ", items, budget)
+
+
+def _recent(entries: List[str], limit: Optional[int] = None) -> List[str]:
+    """Newest first, without repeats (case-insensitive)."""
+    seen, recent = set(), []
+    for entry in reversed(entries):
+        key = " ".join(entry.lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            recent.append(f'"{_clip(entry)}"')
+            if limit is not None and len(recent) >= limit:
+                break
+    return recent
+
+
+def _feedback(record: UserRecord, budget: int) -> str:
+    feedback = record.feedback or []
+    if not feedback:
+        return ""
+    ratings = [float(m.group(1)) for f in feedback for m in _RATING.finditer(f)]
+    summary = f"{len(feedback)} entries"
+    if ratings:
+        summary += f", avg rating {sum(ratings) / len(ratings):.1f}/5"
+    line = _fit(f"- Feedback ({summary}), latest: ", _recent(feedback), budget)
+    return line or _fit("- Feedback: ", [summary], budget)
+
+
+def _history(record: UserRecord, budget: int, items: int) -> str:
+    return _fit("- Recent requests: ", _recent(record.history or [], items), budget)
+
+
+@dataclass
+class _UserContext:
+    sections: Dict[str, str] = field(default_factory=dict)
+    # Bumped on every write, so a render that raced a write is not cached.
+    generation: Dict[str, int] = field(default_factory=dict)
+    summary: Optional[str] = None
+
+
+class ContextAssembler:
+    """
+    Builds and caches the per-user context summary injected into prompts.
+    Args:
+        memory: UserContextMemory to read from; the assembler subscribes to
+            its writes for invalidation.
+        token_budget (int): Approximate max tokens for the whole summary.
+        history_items (int): Max recent requests listed.
+        ttl (float): Seconds a cached summary is trusted without a write.
+        max_users (int): Users whose summaries are kept (LRU).
+    """
+
+    def __init__(
+        self,
+        memory: Any,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        history_items: int = DEFAULT_HISTORY_ITEMS,
+        ttl: float = DEFAULT_TTL,
+        max_users: int = DEFAULT_MAX_USERS,
+    ):
+        self.memory = memory
+        self.token_budget = token_budget
+        self.history_items = history_items
+        self._cache = TTLCache(maxsize=max_users, ttl=ttl)
+        self._lock = threading.Lock()
+        self.renders = 0
+        memory.subscribe(self.invalidate)
+
+    def _entry(self, user_id: str) -> _UserContext:
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                entry = _UserContext()
+                self._cache.set(user_id, entry)
+            return entry
+
+    def invalidate(self, user_id: str, section: Optional[str] = None) -> None:
+        """Drop one cached section (or all of them) for a user after a write."""
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return
+            for name in [section] if section else list(SECTION_SHARES):
+                entry.generation[name] = entry.generation.get(name, 0) + 1
+                entry.sections.pop(name, None)
+            entry.summary = None
+
+    def _render(self, name: str, record: UserRecord) -> str:
+        budget = int(self.token_budget * SECTION_SHARES[name])
+        self.renders += 1
+        if name == "profile":
+            return _profile(record, budget)
+        if name == "preferences":
+            return _preferences(record, budget)
+        if name == "feedback":
+            return _feedback(record, budget)
+        return _history(record, budget, self.history_items)
+
+    def summary(self, user_id: str) -> str:
+        """
+        The user's context block, or "" when nothing is known about them.
+        Only sections invalidated since the last call are re-rendered.
+        """
+        entry = self._entry(user_id)
+        cached = entry.summary
+        if cached is not None:
+            return cached
+        with self._lock:
+            stale = {n: entry.generation.get(n, 0) for n in SECTION_SHARES}
+            stale = {n: g for n, g in stale.items() if n not in entry.sections}
+        if stale:
+            record = self.memory.get(user_id)
+            rendered = {name: self._render(name, record) for name in stale}
+            with self._lock:
+                for name, text in rendered.items():
+                    if entry.generation.get(name, 0) == stale[name]:
+                        entry.sections[name] = text
+        lines = [entry.sections.get(n) for n in SECTION_SHARES]
+        lines = [line for line in lines if line]
+        if not lines:
+            text = ""
+        else:
+            text = "\n".join(
+                [f"User context (user_id: {user_id}; use it to personalize):"] + lines
+            )
+        with self._lock:
+            if all(n in entry.sections for n in SECTION_SHARES):
+                entry.summary = text
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "renders": self.renders}
+
+
+_assembler: Optional[ContextAssembler] = None
+_assembler_lock = threading.Lock()
+
+
+def context_assembler() -> ContextAssembler:
+    """The shared assembler over ``tools.user_context_memory``."""
+    global _assembler
+    if _assembler is None:
+        with _assembler_lock:
+            if _assembler is None:
+                from travel_planner.tools import user_context_memory
+
+                _assembler = ContextAssembler(user_context_memory)
+    return _assembler
+
+
+# Invocations whose user message is already in history: one turn reaches
+# several model calls (root, then travel_inspiration_agent after a transfer).
+_recorded_turns = TTLCache(maxsize=4096, ttl=3600)
+
+
+def record_user_turn(callback_context: Any, llm_request: Any) -> None:
+    """
+    before_model_callback adding the user's message to their history, once
+    per invocation. Attach it only to agents that talk to the user directly;
+    inside an AgentTool the "user" message is another agent's request.
+    """
+    content = callback_context.user_content
+    if content is None or not content.parts:
+        return None
+    text = "".join(p.text for p in content.parts if p.text).strip()
+    if not text or callback_context.invocation_id in _recorded_turns:
+        return None
+    _recorded_turns.set(callback_context.invocation_id, True)
+    context_assembler().memory.add_history(callback_context.user_id, text)
+    return None
+
+
+def inject_user_context(callback_context: Any, llm_request: Any) -> None:
+    """before_model_callback appending the user's context to the instruction."""
+    summary = context_assembler().summary(callback_context.user_id)
+    if summary:
+        llm_request.append_instructions([summary])
+    return None
@@ -0,0 +1,482 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from travel_planner.geocoding import normalize_location
+
+# --- Local Events Store ---
+# Event feeds (iCal .ics or JSON files) are ingested into per-destination
+# indexes kept sorted by start time. An "events between D1 and D2" query
+# bisects the start list, widened by the longest event duration seen at that
+# destination, so it costs O(log n + k). Feeds in TRAVEL_EVENTS_DIR are
+# re-scanned periodically and only new or changed files are ingested; events
+# are de-duplicated by UID, so re-ingesting a feed updates entries in place,
+# and events that disappear from a feed (or whose file is deleted) are dropped.
+# Times are stored as wall-clock time at the destination: UTC or offset times
+# are converted to the feed's zone (X-WR-TIMEZONE / "timezone").
+#
+#   python -m travel_planner.events feeds/*.ics --query Paris 2026-07-01 2026-07-31
+
+EVENTS_DIR = os.environ.get("TRAVEL_EVENTS_DIR")
+RESCAN_SECONDS = float(os.environ.get("TRAVEL_EVENTS_RESCAN", 60))
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_PAGE_SIZE = 10
+
+
+@dataclass(frozen=True)
+class Event:
+    uid: str
+    destination: str
+    title: str
+    start: datetime  # wall-clock time at the destination
+    end: datetime  # exclusive
+    venue: str = ""
+    category: str = ""
+    url: str = ""
+    description: str = ""
+
+
+@dataclass
+class EventPage:
+    events: List[Event]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+
+# -- parsing --
+
+
+def _zone(name: Optional[str]) -> Optional[tzinfo]:
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name.strip())
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown time zone '{name}'") from None
+
+
+def _parse_when(
+    value: Any, end_of_day: bool = False, tz: Optional[tzinfo] = None
+) -> datetime:
+    """
+    ISO date/datetime (or iCal basic format) -> naive wall-clock datetime.
+    Times with a zone or offset are converted to ``tz`` first (when given).
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    else:
+        text = str(value).strip()
+        if re.fullmatch(r"\d{8}", text):
+            parsed = datetime.strptime(text, "%Y%m%d")
+        elif re.fullmatch(r"\d{8}T\d{6}Z?", text):
+            parsed = datetime.strptime(text[:15], "%Y%m%dT%H%M%S")
+            if text.endswith("Z"):
+                parsed = parsed.replace(tzinfo=timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            if end_of_day and len(text) == 10:
+                parsed += timedelta(days=1)  # an inclusive end date covers that day
+    if parsed.tzinfo is not None and tz is not None:
+        parsed = parsed.astimezone(tz)
+    return parsed.replace(tzinfo=None)
+
+
+def _event(
+    data: Dict[str, Any], destination: str, source: str, tz: Optional[tzinfo] = None
+) -> Event:
+    start = _parse_when(data["start"], tz=tz)
+    if data.get("end"):
+        end = _parse_when(data["end"], end_of_day=True, tz=tz)
+    elif len(str(data["start"]).strip()) in (8, 10):
+        end = start + timedelta(days=1)  # all-day event
+    else:
+        end = start
+    title = str(data.get("title") or data.get("summary") or "").strip()
+    uid = str(data.get("uid") or data.get("id") or f"{source}:{title}:{start}")
+    return Event(
+        uid=uid,
+        destination=str(data.get("destination") or destination).strip(),
+        title=title,
+        start=start,
+        end=max(end, start),
+        venue=str(data.get("venue") or data.get("location") or "").strip(),
+        category=str(data.get("category") or "").strip(),
+        url=str(data.get("url") or "").strip(),
+        description=str(data.get("description") or "").strip(),
+    )
+
+
+def parse_json_feed(text: str, destination: str, source: str = "") -> List[Event]:
+    """
+    Parse a JSON feed: a list of events or {"destination": ..., "timezone":
+    ..., "events": [...]}. Each event needs "title" and "start"; "end"
+    (inclusive for plain dates), "destination", "uid", "venue", "category",
+    "url", "description" are optional. Times with an offset are converted to
+    the feed's "timezone" (an IANA name such as "Asia/Tokyo").
+    """
+    data = json.loads(text)
+    tz = None
+    if isinstance(data, dict):
+        destination = data.get("destination") or destination
+        tz = _zone(data.get("timezone"))
+        data = data.get("events", [])
+    return [_event(item, destination, source, tz) for item in data]
+
+
+_ICAL_ESCAPES = {"\\n": "\n", "\\N": "\n", "\\,": ",", "\\;": ";", "\\\\": "\\"}
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\[nN,;\\]", lambda m: _ICAL_ESCAPES[m.group(0)], value)
+
+
+def _ical_lines(text: str) -> Iterator[Tuple[str, Dict[str, str], str]]:
+    """Unfolded (NAME, params, value) content lines."""
+    unfolded = re.sub(r"\r?\n[ \t]", "", text)
+    for line in unfolded.splitlines():
+        if ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, *params = head.split(";")
+        yield name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+
+def _ical_when(value: str, params: Dict[str, str]) -> Any:
+    """
+    DTSTART/DTEND value: dates and floating times stay strings, UTC (``Z``)
+    and TZID times become aware datetimes.
+    """
+    value = value.strip()
+    if not re.fullmatch(r"\d{8}T\d{6}Z?", value):
+        return value
+    parsed = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=timezone.utc)
+    try:
+        zone = _zone(params.get("TZID", "").strip('"'))
+    except ValueError:
+        zone = None  # e.g. a Windows zone name; treat as floating time
+    return parsed.replace(tzinfo=zone) if zone else value
+
+
+def parse_ical_feed(text: str, destination: str, source: str = "") -> List[Event]:
+    """
+    Parse VEVENTs from an iCalendar feed. The destination comes from an
+    X-TRAVEL-DESTINATION property (event or calendar level), else the caller's.
+    UTC and TZID times are converted to the calendar's X-WR-TIMEZONE.
+    """
+    events: List[Event] = []
+    current: Optional[Dict[str, Any]] = None
+    tz: Optional[tzinfo] = None
+    for name, params, value in _ical_lines(text):
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            current = {}
+        elif name == "END" and value.upper() == "VEVENT" and current is not None:
+            if "start" in current:
+                if "end" not in current and "duration" in current:
+                    start = current["start"]
+                    if not isinstance(start, datetime):
+                        start = _parse_when(start)
+                    current["end"] = start + current["duration"]
+                events.append(_event(current, destination, source, tz))
+            current = None
+        elif current is None:
+            if name == "X-TRAVEL-DESTINATION":
+                destination = _unescape(value)
+            elif name == "X-WR-TIMEZONE":
+                tz = _zone(value)
+        elif name == "DTSTART":
+            current["start"] = _ical_when(value, params)
+        elif name == "DTEND":
+            # iCal DTEND is already exclusive; keep it as a datetime.
+            end = _ical_when(value, params)
+            current["end"] = end if isinstance(end, datetime) else _parse_when(end)
+        elif name == "DURATION":
+            current["duration"] = _parse_duration(value)
+        else:
+            key = {
+                "UID": "uid",
+                "SUMMARY": "title",
+                "LOCATION": "venue",
+                "URL": "url",
+                "DESCRIPTION": "description",
+                "CATEGORIES": "category",
+                "X-TRAVEL-DESTINATION": "destination",
+            }.get(name)
+            if key:
+                current[key] = _unescape(value)
+    return events
+
+
+def _parse_duration(value: str) -> timedelta:
+    match = re.fullmatch(
+        r"P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?", value.strip()
+    )
+    if not match:
+        return timedelta(0)
+    weeks, days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return timedelta(
+        weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds
+    )
+
+
+def parse_feed(path: str) -> List[Event]:
+    """Parse a .ics or .json feed; the file name is the default destination."""
+    text = Path(path).read_text(encoding="utf-8")
+    destination = Path(path).stem.replace("_", " ")
+    if path.endswith(".ics"):
+        return parse_ical_feed(text, destination, source=path)
+    return parse_json_feed(text, destination, source=path)
+
+
+# -- index --
+
+
+@dataclass
+class _DestinationIndex:
+    starts: List[datetime] = field(default_factory=list)
+    events: List[Event] = field(default_factory=list)
+    max_duration: timedelta = timedelta(0)
+
+    def insert(self, event: Event) -> None:
+        i = bisect.bisect_right(self.starts, event.start)
+        self.starts.insert(i, event.start)
+        self.events.insert(i, event)
+        self.max_duration = max(self.max_duration, event.end - event.start)
+
+    def remove(self, event: Event) -> None:
+        lo = bisect.bisect_left(self.starts, event.start)
+        hi = bisect.bisect_right(self.starts, event.start)
+        for i in range(lo, hi):
+            if self.events[i].uid == event.uid:
+                del self.starts[i]
+                del self.events[i]
+                return
+
+    def rebuild(self, events: Iterable[Event]) -> None:
+        self.events = sorted(events, key=lambda e: e.start)
+        self.starts = [e.start for e in self.events]
+        self.max_duration = max(
+            (e.end - e.start for e in self.events), default=timedelta(0)
+        )
+
+    def overlapping(self, start: datetime, end: datetime) -> List[Event]:
+        """Events with start < ``end`` and end > ``start``, by start time."""
+        lo = bisect.bisect_left(self.starts, start - self.max_duration)
+        hi = bisect.bisect_left(self.starts, end)
+        return [
+            e
+            for e in self.events[lo:hi]
+            if e.end > start or (e.end == e.start and e.start >= start)
+        ]
+
+
+class EventStore:
+    """
+    In-memory events index, optionally fed from a directory of feed files.
+    Args:
+        feed_dir (str): Directory of .ics/.json feeds; None for ingest-only use.
+        rescan_seconds (float): Min seconds between feed directory scans.
+    """
+
+    def __init__(
+        self, feed_dir: Optional[str] = None, rescan_seconds: float = RESCAN_SECONDS
+    ):
+        self.feed_dir = feed_dir
+        self.rescan_seconds = rescan_seconds
+        self._indexes: Dict[str, _DestinationIndex] = {}
+        self._by_uid: Dict[str, Event] = {}
+        # Feed file -> UIDs it contained at its last ingest, and the reverse
+        # (the latest file to supply each UID), to drop deleted events.
+        self._uids_by_source: Dict[str, Set[str]] = {}
+        self._source_of: Dict[str, str] = {}
+        self._files: Dict[str, int] = {}  # path -> mtime_ns at last ingest
+        self._scanned_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self.errors: Dict[str, str] = {}
+
+    @staticmethod
+    def _key(destination: str) -> str:
+        return normalize_location(destination)
+
+    def ingest(self, events: Iterable[Event], source: Optional[str] = None) -> int:
+        """
+        Add or replace (by UID) events; returns how many were new, changed or
+        removed. With ``source`` (a feed file), ``events`` is that feed's full
+        contents and events it supplied before but no longer lists are
+        dropped. Small batches are inserted in place, large ones rebuild the
+        index. A UID listed twice (e.g. an iCal recurrence override) keeps
+        its last occurrence.
+        """
+        events = list({event.uid: event for event in events}.values())
+        changed = 0
+        with self._lock:
+            batches: Dict[str, List[Event]] = {}
+            for event in events:
+                if source is None:
+                    self._source_of.pop(event.uid, None)
+                else:
+                    self._source_of[event.uid] = source
+                old = self._by_uid.get(event.uid)
+                if old == event:
+                    continue
+                if old is not None:
+                    self._indexes[self._key(old.destination)].remove(old)
+                self._by_uid[event.uid] = event
+                batches.setdefault(self._key(event.destination), []).append(event)
+                changed += 1
+            for key, batch in batches.items():
+                index = self._indexes.setdefault(key, _DestinationIndex())
+                if len(batch) > 16 and len(batch) * 8 > len(index.events):
+                    index.rebuild(index.events + batch)
+                else:
+                    for event in batch:
+                        index.insert(event)
+            if source is not None:
+                uids = {event.uid for event in events}
+                for uid in self._uids_by_source.get(source, set()) - uids:
+                    changed += self._drop(uid, source)
+                self._uids_by_source[source] = uids
+        return changed
+
+    def _drop(self, uid: str, source: str) -> int:
+        # Only if no other feed has supplied this UID since.
+        if self._source_of.get(uid) != source:
+            return 0
+        event = self._by_uid.pop(uid)
+        del self._source_of[uid]
+        self._indexes[self._key(event.destination)].remove(event)
+        return 1
+
+    def remove_source(self, source: str) -> int:
+        """Drop every event a feed file supplied; returns how many."""
+        with self._lock:
+            uids = self._uids_by_source.pop(source, set())
+            return sum(self._drop(uid, source) for uid in uids)
+
+    def refresh(self, force: bool = False) -> int:
+        """Ingest feed files that are new or changed since the last scan."""
+        if not self.feed_dir:
+            return 0
+        now = time.monotonic()
+        if (
+            not force
+            and self._scanned_at is not None
+            and now - self._scanned_at < self.rescan_seconds
+        ):
+            return 0
+        with self._lock:
+            self._scanned_at = now
+            changed = 0
+            paths = [
+                path
+                for path in sorted(Path(self.feed_dir).glob("*"))
+                if path.suffix in (".ics", ".json")
+            ]
+            present = {str(path) for path in paths}
+            for gone in [p for p in self._files if p not in present]:
+                changed += self.remove_source(gone)
+                del self._files[gone]
+                self.errors.pop(gone, None)
+            for path in paths:
+                mtime = path.stat().st_mtime_ns
+                if self._files.get(str(path)) == mtime:
+                    continue
+                try:
+                    changed += self.ingest(parse_feed(str(path)), source=str(path))
+                    self.errors.pop(str(path), None)
+                except (OSError, ValueError, KeyError) as e:
+                    # Keep serving the feed's previous events.
+                    self.errors[str(path)] = str(e)
+                self._files[str(path)] = mtime
+            return changed
+
+    def _index_for(self, destination: str) -> Optional[_DestinationIndex]:
+        key = self._key(destination)
+        index = self._indexes.get(key)
+        if index is None and "," in key:
+            index = self._indexes.get(key.split(",")[0].strip())
+        return index
+
+    def has_destination(self, destination: str) -> bool:
+        """True if any feed has events for ``destination``."""
+        self.refresh()
+        with self._lock:
+            index = self._index_for(destination)
+            return bool(index and index.events)
+
+    def search(
+        self,
+        destination: str,
+        start: date,
+        end: date,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> EventPage:
+        """
+        Events at ``destination`` overlapping ``start``..``end`` (inclusive
+        dates), ordered by start time, one page at a time.
+        """
+        self.refresh()
+        window_start = _parse_when(start)
+        window_end = _parse_when(end) + timedelta(days=1)
+        with self._lock:
+            index = self._index_for(destination)
+            matches = index.overlapping(window_start, window_end) if index else []
+        page = max(page, 1)
+        offset = (page - 1) * page_size
+        return EventPage(
+            matches[offset : offset + page_size], len(matches), page, page_size
+        )
+
+    def __len__(self) -> int:
+        return len(self._by_uid)
+
+
+event_store = EventStore(EVENTS_DIR)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest event feeds and query them.")
+    parser.add_argument("feeds", nargs="*", help=".ics or .json feed files")
+    parser.add_argument(
+        "--query", nargs=3, metavar=("DESTINATION", "START", "END"), default=None
+    )
+    parser.add_argument("--page", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    store = event_store
+    for path in args.feeds:
+        print(f"{path}: {store.ingest(parse_feed(path), source=path)} changed events")
+    store.refresh(force=True)
+    for path, error in store.errors.items():
+        print(f"{path}: {error}")
+    print(f"{len(store)} events indexed")
+    if args.query:
+        destination, start, end = args.query
+        result = store.search(
+            destination, date.fromisoformat(start), date.fromisoformat(end), args.page
+        )
+        for event in result.events:
+            print(f"  {event.start:%Y-%m-%d %H:%M}  {event.title}  {event.venue}")
+        print(f"page {result.page} of {result.pages} ({result.total} events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from google.adk.tools import BaseTool, ToolContext
+
+from travel_planner.streaming import publish
+from travel_planner.tracing import tracer
+
+# --- Parallel Sub-Agent Fan-Out ---
+# A full "plan my trip" request needs answers from several independent
+# specialists. Running their AgentTools one after another makes latency the
+# sum of every LLM round trip; dispatching them together makes it the max.
+
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("TRAVEL_FANOUT_CONCURRENCY", 4))
+DEFAULT_BRANCH_TIMEOUT = float(os.environ.get("TRAVEL_FANOUT_BRANCH_TIMEOUT", 30))
+
+
+class ParallelFanout:
+    """
+    Dispatches requests to several agent tools concurrently and merges the
+    answers into a single dict keyed by agent name.
+    Args:
+        tools (dict): Agent name -> AgentTool (or any tool taking ``request``).
+        max_concurrency (int): Max branches running at the same time.
+        branch_timeout (float): Seconds before a branch is abandoned.
+    """
+
+    def __init__(
+        self,
+        tools: Dict[str, BaseTool],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        branch_timeout: float = DEFAULT_BRANCH_TIMEOUT,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.tools = tools
+        self.max_concurrency = max_concurrency
+        self.branch_timeout = branch_timeout
+
+    async def _run_branch(
+        self,
+        name: str,
+        request: str,
+        tool_context: ToolContext,
+        limit: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        # Branches bypass ADK's tool callbacks, so trace them here.
+        with tracer.span(f"tool {name}", "tool", tool=name, fanout=True) as span:
+            async with limit:
+                try:
+                    result = await asyncio.wait_for(
+                        self.tools[name].run_async(
+                            args={"request": request}, tool_context=tool_context
+                        ),
+                        timeout=self.branch_timeout,
+                    )
+                    status = "ok"
+                except asyncio.TimeoutError:
+                    result = (
+                        f"⏱️ {name} did not answer within {self.branch_timeout:g}s; "
+                        "continue without it or ask again later."
+                    )
+                    status = "timeout"
+                except Exception as e:
+                    result = f"❌ {name} failed: {str(e)}"
+                    status = "error"
+            if span is not None:
+                span.status = status
+        # Stream each branch as it lands rather than after the slowest one.
+        publish(name, result, status)
+        return {
+            "status": status,
+            "result": result,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    async def run(
+        self,
+        requests: Dict[str, str],
+        tool_context: ToolContext,
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every non-empty request against its agent concurrently.
+        Unknown agent names are reported back instead of raising.
+        """
+        limit = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        merged: Dict[str, Dict[str, Any]] = {}
+        branches = {}
+        for name, request in requests.items():
+            if not request or not request.strip():
+                continue
+            if name not in self.tools:
+                merged[name] = {"status": "error", "result": f"Unknown agent {name}"}
+                continue
+            branches[name] = self._run_branch(name, request, tool_context, limit)
+        results = await asyncio.gather(*branches.values())
+        merged.update(zip(branches.keys(), results))
+        return merged
@@ -0,0 +1,258 @@
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.genai import types
+
+from travel_planner.tools import (
+    calculate_budget,
+    check_visa_requirement,
+    find_local_events,
+    find_visa_free_destinations,
+)
+
+# --- Deterministic Fast Path ---
+# Budget, visa and events answers come straight from local data, yet
+# routed through the agent tree they cost root -> travel_inspiration_agent ->
+# specialist -> tool -> specialist -> travel_inspiration_agent LLM calls.
+# Messages that match one of the structured intents below are answered
+# directly from the tool function; everything else goes to the model. A
+# handler returns None when the captured place is not one the data knows
+# (e.g. "Tokyo this weekend"), and the message then goes to the model too.
+
+# LLM calls made when a static question is delegated all the way down.
+LLM_CALLS_PER_DELEGATED_ANSWER = 5
+# LLM calls saved when travel_inspiration_agent calls a static tool itself
+# instead of going through the specialist agent (its call + summarization).
+LLM_CALLS_PER_DIRECT_TOOL = 2
+
+STATIC_TOOL_NAMES = frozenset(
+    {
+        "calculate_budget",
+        "compare_destination_budgets",
+        "check_visa_requirement",
+        "find_visa_free_destinations",
+        "find_local_events",
+        "get_language_culture_tips",
+    }
+)
+
+_PLACE = r"(?P<destination>[A-Za-z][A-Za-z .'-]*?)"
+_NATIONALITY = r"(?P<nationality>[A-Za-z][A-Za-z .'-]*?)"
+_DATE = r"\d{4}-\d{2}-\d{2}"
+_TRAVELERS = r"(?:\s+for\s+(?P<travelers>\d+)\s+(?:people|persons|travell?ers|adults))?"
+
+
+@dataclass(frozen=True)
+class Intent:
+    name: str
+    patterns: List[Pattern[str]]
+    handler: Callable[[Dict[str, str], str], Optional[str]]
+
+
+def _compile(*patterns: str) -> List[Pattern[str]]:
+    return [re.compile(p, re.IGNORECASE) for p in patterns]
+
+
+def _budget(groups: Dict[str, str], user_id: str) -> Optional[str]:
+    from travel_planner.budget import cost_table
+
+    if cost_table().lookup(groups["destination"].strip()) is None:
+        return None
+    return calculate_budget(
+        user_id=user_id,
+        destination=groups["destination"].strip(),
+        days=int(groups["days"]),
+        travelers=int(groups.get("travelers") or 1),
+    )
+
+
+def _known_countries(*names: str) -> bool:
+    from travel_planner.visa import visa_rules
+
+    try:
+        rules = visa_rules.rules()
+    except Exception:
+        return False
+    return all(rules.resolve(name.strip()) is not None for name in names)
+
+
+def _visa(groups: Dict[str, str], user_id: str) -> Optional[str]:
+    from travel_planner.visa import visa_rules
+
+    try:
+        rule = visa_rules.rules().lookup(
+            groups["nationality"].strip(), groups["destination"].strip()
+        )
+    except Exception:
+        return None
+    # No rule on file for the pair: the model can still research it.
+    if rule is None or rule.requirement == "unknown":
+        return None
+    return check_visa_requirement(
+        nationality=groups["nationality"].strip(),
+        destination=groups["destination"].strip(),
+    )
+
+
+def _visa_free(groups: Dict[str, str], user_id: str) -> Optional[str]:
+    if not _known_countries(groups["nationality"]):
+        return None
+    return find_visa_free_destinations(nationality=groups["nationality"].strip())
+
+
+def _events(groups: Dict[str, str], user_id: str) -> Optional[str]:
+    from travel_planner.events import event_store
+
+    # Without feed data for the place, news_agent is the better source.
+    if not event_store.has_destination(groups["destination"].strip()):
+        return None
+    return find_local_events(
+        destination=groups["destination"].strip(),
+        start_date=groups.get("start_date"),
+        end_date=groups.get("end_date"),
+    )
+
+
+INTENTS = [
+    Intent(
+        "budget",
+        _compile(
+            rf"(?:estimate\s+(?:the\s+|a\s+)?)?budget\s+for\s+(?:a\s+)?(?P<days>\d+)[\s-]+days?\s+(?:trip\s+)?(?:in|to)\s+{_PLACE}{_TRAVELERS}",
+            rf"how\s+much\s+(?:does|would|will)\s+(?:a\s+)?(?P<days>\d+)[\s-]+days?\s+trip\s+to\s+{_PLACE}\s+cost{_TRAVELERS}",
+        ),
+        _budget,
+    ),
+    Intent(
+        "visa",
+        _compile(
+            rf"(?:check\s+)?visa\s+(?:requirements?\s+)?for\s+{_NATIONALITY}\s+(?:citizens?\s+|passport\s+holders?\s+)?(?:to|visiting|travell?ing\s+to)\s+{_PLACE}",
+            rf"do\s+{_NATIONALITY}\s+(?:citizens|passport\s+holders)\s+need\s+a\s+visa\s+(?:for|to)\s+{_PLACE}",
+        ),
+        _visa,
+    ),
+    Intent(
+        "visa_free",
+        _compile(
+            rf"(?:which|what)\s+(?:countries|destinations)\s+(?:can\s+)?{_NATIONALITY}\s+(?:citizens\s+|passport\s+holders\s+)?(?:visit|travel\s+to|go\s+to)\s+(?:without\s+a\s+visa|visa[\s-]free)",
+            rf"list\s+(?:the\s+)?visa[\s-]free\s+(?:countries|destinations)\s+for\s+{_NATIONALITY}(?:\s+(?:citizens|passport\s+holders))?",
+            rf"where\s+can\s+{_NATIONALITY}\s+(?:citizens\s+|passport\s+holders\s+)?(?:go|travel)\s+(?:without\s+a\s+visa|visa[\s-]free)",
+        ),
+        _visa_free,
+    ),
+    Intent(
+        "events",
+        _compile(
+            rf"(?:local\s+)?events\s+in\s+{_PLACE}(?:\s+(?:from|between)\s+(?P<start_date>{_DATE})\s+(?:to|and|until)\s+(?P<end_date>{_DATE}))?",
+        ),
+        _events,
+    ),
+]
+
+_TRAILING = re.compile(r"[\s?.!]+$")
+
+
+@dataclass
+class FastPathMatch:
+    intent: str
+    answer: str
+
+
+@dataclass
+class FastPathStats:
+    messages_seen: int = 0
+    answered: int = 0
+    direct_tool_calls: int = 0
+    llm_calls_avoided: int = 0
+    by_intent: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_message(self) -> None:
+        with self._lock:
+            self.messages_seen += 1
+
+    def record_answer(self, intent: str) -> None:
+        with self._lock:
+            self.answered += 1
+            self.llm_calls_avoided += LLM_CALLS_PER_DELEGATED_ANSWER
+            self.by_intent[intent] = self.by_intent.get(intent, 0) + 1
+
+    def record_direct_tool(self, tool_name: str) -> None:
+        with self._lock:
+            self.direct_tool_calls += 1
+            self.llm_calls_avoided += LLM_CALLS_PER_DIRECT_TOOL
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "messages_seen": self.messages_seen,
+                "answered": self.answered,
+                "direct_tool_calls": self.direct_tool_calls,
+                "llm_calls_avoided": self.llm_calls_avoided,
+                "by_intent": dict(self.by_intent),
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+def match_intent(message: str, user_id: str = "") -> Optional[FastPathMatch]:
+    """
+    Answer ``message`` deterministically if it is a structured static query.
+    Only whole-message matches count, so open-ended questions that merely
+    mention a visa or a budget still go to the agents.
+    """
+    text = _TRAILING.sub("", message.strip())
+    for intent in INTENTS:
+        for pattern in intent.patterns:
+            m = pattern.fullmatch(text)
+            if m:
+                groups = {k: v for k, v in m.groupdict().items() if v}
+                answer = intent.handler(groups, user_id)
+                if answer is not None:
+                    return FastPathMatch(intent.name, answer)
+    return None
+
+
+def _latest_user_text(llm_request: LlmRequest) -> Optional[str]:
+    # Only route fresh user turns, never a model call that follows a tool
+    # response within the same invocation.
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts:
+        return None
+    if any(p.function_response for p in last.parts):
+        return None
+    text = "".join(p.text for p in last.parts if p.text)
+    return text or None
+
+
+def fast_path_callback(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """before_model_callback that short-circuits structured static intents."""
+    text = _latest_user_text(llm_request)
+    if text is None:
+        return None
+    fast_path_stats.record_message()
+    match = match_intent(text, callback_context.user_id)
+    if match is None:
+        return None
+    fast_path_stats.record_answer(match.intent)
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=match.answer)])
+    )
+
+
+def count_direct_tool_calls(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> None:
+    """after_tool_callback recording static tools called without a specialist."""
+    if tool.name in STATIC_TOOL_NAMES:
+        fast_path_stats.record_direct_tool(tool.name)
+    return None
@@ -0,0 +1,233 @@
+import asyncio
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from travel_planner.cache import TTLCache
+from travel_planner.tracing import tracer
+
+# --- Geocoding Layer ---
+# Shared by every tool that needs coordinates for a place name. Lookups go
+# through an in-process LRU/TTL cache, then an optional SQLite tier, and only
+# then to Nominatim (which is rate-limited to 1 request/second).
+
+GEOCODE_TTL_SECONDS = 30 * 24 * 3600  # place coordinates rarely change
+NOT_FOUND_TTL_SECONDS = 3600  # retry unknown names (typos, new places) hourly
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    latitude: float
+    longitude: float
+    address: str = ""
+
+
+_NOT_FOUND = object()
+MISS = object()  # returned by lookup_cached when no tier has the key
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_location(location: str) -> str:
+    """
+    Normalize a free-text location into a cache key.
+    "  Paris,France " and "paris, france" map to the same key.
+    """
+    key = _WHITESPACE.sub(" ", location.strip().casefold())
+    key = re.sub(r"\s*,\s*", ", ", key)
+    return key.strip(" .,;")
+
+
+class SQLiteGeocodeStore:
+    """
+    Persistent geocode tier so restarts and sibling workers share results.
+    Negative results (unknown locations) are stored too, with ``found = 0``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS geocode (
+                    key TEXT PRIMARY KEY,
+                    latitude REAL,
+                    longitude REAL,
+                    address TEXT,
+                    found INTEGER NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """)
+            self._conn.commit()
+
+    def get(self, key: str, max_age: float, not_found_max_age: float) -> Any:
+        """Return a GeoPoint, the not-found marker, or None if absent/stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latitude, longitude, address, found, stored_at"
+                " FROM geocode WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        latitude, longitude, address, found, stored_at = row
+        age = time.time() - stored_at
+        if age > (max_age if found else not_found_max_age):
+            return None
+        if not found:
+            return _NOT_FOUND
+        return GeoPoint(latitude, longitude, address or "")
+
+    def put(self, key: str, point: Optional[GeoPoint]) -> None:
+        if point is None:
+            values = (key, None, None, None, 0, time.time())
+        else:
+            values = (
+                key,
+                point.latitude,
+                point.longitude,
+                point.address,
+                1,
+                time.time(),
+            )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?)", values
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class GeocodingService:
+    """
+    Cached geocoder shared across tools.
+    Args:
+        user_agent (str): User agent sent to Nominatim.
+        cache_size (int): Max entries held in the in-process LRU.
+        ttl (float): Lifetime of a successful lookup, in seconds.
+        db_path (str): Optional SQLite file for the persistent tier.
+        min_delay_seconds (float): Spacing between upstream requests.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = "travel_planner",
+        cache_size: int = 4096,
+        ttl: float = GEOCODE_TTL_SECONDS,
+        db_path: Optional[str] = None,
+        min_delay_seconds: float = 1.0,
+    ):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.min_delay_seconds = min_delay_seconds
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self.store = SQLiteGeocodeStore(db_path) if db_path else None
+        self.persistent_hits = 0
+        self.upstream_calls = 0
+        self._geocode_fn = None
+        self._init_lock = threading.Lock()
+
+    def _upstream(self):
+        # One Nominatim client for the whole process, wrapped in geopy's
+        # thread-safe RateLimiter to respect the 1 req/s usage policy.
+        if self._geocode_fn is None:
+            with self._init_lock:
+                if self._geocode_fn is None:
+                    from geopy.extra.rate_limiter import RateLimiter
+                    from geopy.geocoders import Nominatim
+
+                    nominatim = Nominatim(user_agent=self.user_agent)
+                    self._geocode_fn = RateLimiter(
+                        nominatim.geocode,
+                        min_delay_seconds=self.min_delay_seconds,
+                        max_retries=0,
+                        swallow_exceptions=False,
+                    )
+        return self._geocode_fn
+
+    def lookup_cached(self, location: str) -> Any:
+        """
+        Resolve ``location`` from the cache tiers only.
+        Returns a GeoPoint, None for a cached "not found", or the module-level
+        ``MISS`` marker when the caller has to go upstream.
+        """
+        key = normalize_location(location)
+        cached = self.cache.get(key, MISS)
+        if cached is not MISS:
+            return None if cached is _NOT_FOUND else cached
+        if self.store is not None:
+            stored = self.store.get(key, self.ttl, NOT_FOUND_TTL_SECONDS)
+            if stored is not None:
+                self.persistent_hits += 1
+                self._remember(key, stored)
+                return None if stored is _NOT_FOUND else stored
+        return MISS
+
+    def geocode(self, location: str) -> Optional[GeoPoint]:
+        """
+        Resolve a place name to coordinates.
+        Args:
+            location (str): City or place name.
+        Returns:
+            GeoPoint or None if the location is unknown.
+        """
+        with tracer.span("geocode", "geocode", location=location) as span:
+            cached = self.lookup_cached(location)
+            if cached is not MISS:
+                if span is not None:
+                    span.set(cache="hit", found=cached is not None)
+                return cached
+            key = normalize_location(location)
+            self.upstream_calls += 1
+            loc = self._upstream()(location)
+            point = (
+                GeoPoint(loc.latitude, loc.longitude, getattr(loc, "address", "") or "")
+                if loc
+                else None
+            )
+            self._remember(key, _NOT_FOUND if point is None else point)
+            if self.store is not None:
+                self.store.put(key, point)
+            if span is not None:
+                span.set(cache="miss", found=point is not None)
+            return point
+
+    def _remember(self, key: str, value: Any) -> None:
+        ttl = NOT_FOUND_TTL_SECONDS if value is _NOT_FOUND else None
+        self.cache.set(key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        stats["persistent_hits"] = self.persistent_hits
+        stats["upstream_calls"] = self.upstream_calls
+        return stats
+
+
+geocoder = GeocodingService(db_path=os.environ.get("TRAVEL_GEOCODE_CACHE_DB"))
+
+
+def geocode(location: str) -> Optional[GeoPoint]:
+    """Resolve a place name through the shared, cached geocoder."""
+    return geocoder.geocode(location)
+
+
+async def geocode_async(location: str) -> Optional[GeoPoint]:
+    """
+    Async variant of ``geocode``: cache hits are answered inline, misses run
+    the blocking Nominatim lookup in a worker thread.
+    """
+    cached = geocoder.lookup_cached(location)
+    if cached is not MISS:
+        if tracer.enabled:
+            with tracer.span("geocode", "geocode", location=location) as span:
+                span.set(cache="hit", found=cached is not None)
+        return cached
+    return await asyncio.to_thread(geocoder.geocode, location)
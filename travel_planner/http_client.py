@@ -0,0 +1,272 @@
+import asyncio
+import os
+import random
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from travel_planner.tracing import Span, tracer
+
+# --- Outbound HTTP Layer ---
+# Every tool that talks to a public API (Open-Meteo, Overpass, ...) goes
+# through here so connections are pooled and kept alive, concurrent requests
+# per upstream host are capped, and transient failures are retried with
+# exponential backoff.
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class HttpConfig:
+    timeout: float = float(os.environ.get("TRAVEL_HTTP_TIMEOUT", 10))
+    connect_timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    per_host_limit: int = int(os.environ.get("TRAVEL_HTTP_PER_HOST_LIMIT", 8))
+    retries: int = int(os.environ.get("TRAVEL_HTTP_RETRIES", 2))
+    backoff_factor: float = 0.5
+    max_backoff: float = 8.0
+    user_agent: str = "travel_planner/0.1"
+
+
+def _record(
+    span: Optional[Span], attempt: int, response: Optional[httpx.Response]
+) -> None:
+    if span is not None:
+        span.set(
+            attempts=attempt + 1,
+            status_code=response.status_code if response is not None else 0,
+        )
+        if response is None or response.status_code >= 400:
+            span.status = "error"
+        else:
+            span.status = "ok"
+
+
+class AsyncHttpClient:
+    """
+    Pooled, keep-alive async HTTP client with per-host concurrency limits.
+    Args:
+        config (HttpConfig): Timeouts, pool sizes and retry policy.
+        transport (httpx.AsyncBaseTransport): Optional transport override
+            (e.g. a replay transport for offline benchmarks).
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.config = config or HttpConfig()
+        cfg = self.config
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            headers={"User-Agent": cfg.user_agent},
+            transport=transport,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = self._host_limits[host] = asyncio.Semaphore(
+                self.config.per_host_limit
+            )
+        return sem
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.config.max_backoff)
+        delay = self.config.backoff_factor * (2**attempt)
+        return min(delay, self.config.max_backoff) * random.uniform(0.5, 1.0)
+
+    def _span(self, method: str, url: str, **attributes: Any):
+        host = urlsplit(url).hostname or ""
+        return tracer.span(
+            f"{method} {host}", "http", method=method, host=host, **attributes
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying connection errors, timeouts and retryable
+        status codes. The last response (or exception) is returned/raised.
+        """
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        attempts = self.config.retries + 1
+        with self._span(method, url) as span:
+            for attempt in range(attempts):
+                response = None
+                try:
+                    async with self._host_limit(url):
+                        response = await self._client.request(
+                            method, url, params=params, **kwargs
+                        )
+                    _record(span, attempt, response)
+                    if response.status_code not in RETRY_STATUSES:
+                        return response
+                except (httpx.TimeoutException, httpx.NetworkError):
+                    _record(span, attempt, None)
+                    if attempt == attempts - 1:
+                        raise
+                if attempt == attempts - 1:
+                    return response
+                await asyncio.sleep(self._backoff(attempt, response))
+        raise AssertionError("unreachable")
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streamed response whose body is read incrementally by the
+        caller. Failures before the body starts are retried like ``request``;
+        the per-host slot is held until the body has been consumed.
+        """
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        attempts = self.config.retries + 1
+        limit = self._host_limit(url)
+        with self._span(method, url, streamed=True) as span:
+            for attempt in range(attempts):
+                await limit.acquire()
+                response = None
+                try:
+                    request = self._client.build_request(
+                        method, url, params=params, **kwargs
+                    )
+                    response = await self._client.send(request, stream=True)
+                except (httpx.TimeoutException, httpx.NetworkError):
+                    _record(span, attempt, None)
+                    limit.release()
+                    if attempt == attempts - 1:
+                        raise
+                except BaseException:
+                    # Cancellation (e.g. a fan-out branch timing out) or any
+                    # other error must not leak the host slot.
+                    limit.release()
+                    raise
+                else:
+                    _record(span, attempt, response)
+                    if (
+                        response.status_code not in RETRY_STATUSES
+                        or attempt == attempts - 1
+                    ):
+                        break
+                    try:
+                        await response.aclose()
+                    finally:
+                        limit.release()
+                await asyncio.sleep(self._backoff(attempt, response))
+            try:
+                yield response
+            finally:
+                try:
+                    await response.aclose()
+                finally:
+                    limit.release()
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# httpx clients and asyncio semaphores are bound to the loop they were first
+# used on, so keep one pooled client per running event loop.
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]"
+) = weakref.WeakKeyDictionary()
+_transport_override: Optional[httpx.AsyncBaseTransport] = None
+_config = HttpConfig()
+
+
+def get_async_client() -> AsyncHttpClient:
+    """Return the pooled client for the current event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient(
+            _config, transport=_transport_override
+        )
+    return client
+
+
+def configure(
+    config: Optional[HttpConfig] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> None:
+    """
+    Replace the HTTP settings (and optionally the transport) used by clients
+    created from now on. Existing per-loop clients are dropped.
+    """
+    global _config, _transport_override, _sync_session
+    _config = config or HttpConfig()
+    _transport_override = transport
+    _async_clients.clear()
+    _sync_session = None
+
+
+_sync_session: Optional[requests.Session] = None
+_sync_lock = threading.Lock()
+
+
+def get_sync_session() -> requests.Session:
+    """
+    Shared keep-alive ``requests.Session`` for the synchronous tool variants,
+    with the same retry policy as the async client.
+    """
+    global _sync_session
+    if _sync_session is None:
+        with _sync_lock:
+            if _sync_session is None:
+                retry = Retry(
+                    total=_config.retries,
+                    backoff_factor=_config.backoff_factor,
+                    status_forcelist=sorted(RETRY_STATUSES),
+                    allowed_methods=frozenset({"GET", "HEAD"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=_config.max_keepalive_connections,
+                    pool_maxsize=_config.per_host_limit,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.headers["User-Agent"] = _config.user_agent
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sync_session = session
+    return _sync_session
@@ -0,0 +1,365 @@
+import argparse
+import bisect
+import json
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from travel_planner.ranking import rank_candidates, tokenize
+
+# --- Offline POI Index ---
+# Live Overpass queries are slow and rate-limited. For regions we care about
+# most, an OSM extract is imported once into a local SQLite store; at query
+# time the store is loaded into memory with a geohash grid for the spatial
+# filter and an inverted index over name/amenity/shop tokens. Areas outside
+# every imported region still fall back to Overpass.
+
+GEOHASH_PRECISION = 6  # cells are ~1.2 km x 0.6 km
+METERS_PER_DEGREE_LAT = 111320.0
+INDEXED_TAGS = ("name", "amenity", "shop")
+KEPT_TAGS = INDEXED_TAGS + (
+    "addr:street",
+    "addr:housenumber",
+    "addr:city",
+    "addr:country",
+    "cuisine",
+    "opening_hours",
+    "tourism",
+)
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    chars, bits, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch, lon_lo = (ch << 1) | 1, mid
+            else:
+                ch, lon_hi = ch << 1, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch, lat_lo = (ch << 1) | 1, mid
+            else:
+                ch, lat_hi = ch << 1, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def bounding_box(lat: float, lon: float, radius: float) -> Tuple[float, ...]:
+    """(south, west, north, east) of a circle of ``radius`` meters."""
+    dlat = radius / METERS_PER_DEGREE_LAT
+    dlon = radius / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+@dataclass(frozen=True)
+class Region:
+    name: str
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def contains_box(self, south: float, west: float, north: float, east: float):
+        return (
+            self.south <= south
+            and self.west <= west
+            and north <= self.north
+            and east <= self.east
+        )
+
+
+# -- storage / import --
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS regions (
+            name TEXT PRIMARY KEY,
+            south REAL NOT NULL, west REAL NOT NULL,
+            north REAL NOT NULL, east REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pois (
+            osm_type TEXT NOT NULL,
+            osm_id INTEGER NOT NULL,
+            region TEXT NOT NULL,
+            lat REAL NOT NULL,
+            lon REAL NOT NULL,
+            tags TEXT NOT NULL,
+            PRIMARY KEY (osm_type, osm_id)
+        );
+        """)
+    return conn
+
+
+def _is_poi(tags: Dict[str, str]) -> bool:
+    return any(tags.get(tag) for tag in INDEXED_TAGS)
+
+
+def iter_osm_json(path: str) -> Iterator[Tuple[str, int, float, float, Dict]]:
+    """
+    Yield (type, id, lat, lon, tags) from an Overpass/OSM JSON export.
+    Ways and relations are included when exported with ``out center``.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for el in data.get("elements", []):
+        tags = el.get("tags") or {}
+        if not _is_poi(tags):
+            continue
+        if "lat" in el and "lon" in el:
+            lat, lon = el["lat"], el["lon"]
+        elif "center" in el:
+            lat, lon = el["center"]["lat"], el["center"]["lon"]
+        else:
+            continue
+        yield el.get("type", "node"), int(el["id"]), lat, lon, tags
+
+
+def iter_osm_pbf(path: str) -> Iterator[Tuple[str, int, float, float, Dict]]:
+    """Yield POI nodes from an OSM PBF extract (requires ``pyosmium``)."""
+    try:
+        import osmium
+    except ImportError as e:
+        raise ImportError(
+            "Importing .pbf extracts requires pyosmium: pip install osmium"
+        ) from e
+    for obj in osmium.FileProcessor(path, osmium.osm.NODE):
+        tags = {t.k: t.v for t in obj.tags}
+        if _is_poi(tags) and obj.location.valid():
+            yield "node", obj.id, obj.location.lat, obj.location.lon, tags
+
+
+def import_extract(
+    db_path: str,
+    extract_path: str,
+    region: str,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+) -> int:
+    """
+    Import an OSM extract (.json or .pbf) as ``region`` into the POI store.
+    Args:
+        db_path (str): SQLite POI store.
+        extract_path (str): Overpass/OSM JSON export or PBF file.
+        region (str): Region name; re-importing a region replaces it.
+        bbox (tuple): (south, west, north, east) covered by the extract.
+            Defaults to the extent of the imported POIs.
+    Returns:
+        int: Number of POIs imported.
+    """
+    reader = iter_osm_pbf if extract_path.endswith(".pbf") else iter_osm_json
+    conn = _connect(db_path)
+    count = 0
+    south = west = math.inf
+    north = east = -math.inf
+    with conn:
+        conn.execute("DELETE FROM pois WHERE region = ?", (region,))
+        for osm_type, osm_id, lat, lon, tags in reader(extract_path):
+            kept = {k: v for k, v in tags.items() if k in KEPT_TAGS}
+            conn.execute(
+                "INSERT OR REPLACE INTO pois VALUES (?, ?, ?, ?, ?, ?)",
+                (osm_type, osm_id, region, lat, lon, json.dumps(kept)),
+            )
+            south, north = min(south, lat), max(north, lat)
+            west, east = min(west, lon), max(east, lon)
+            count += 1
+        if bbox is None:
+            bbox = (south, west, north, east) if count else None
+        if bbox is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO regions VALUES (?, ?, ?, ?, ?)",
+                (region, *bbox),
+            )
+    conn.close()
+    if poi_index.db_path == db_path:
+        poi_index.invalidate()
+    return count
+
+
+# -- query --
+
+
+class POIIndex:
+    """
+    In-memory spatial + text index over a POI store, loaded on first use.
+    Args:
+        db_path (str): SQLite POI store; None disables the index.
+    """
+
+    def __init__(self, db_path: Optional[str]):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.regions: List[Region] = []
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._tags: List[Dict[str, str]] = []
+        self._cells: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._terms: List[str] = []  # sorted postings keys, for prefix lookups
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            conn = _connect(self.db_path)
+            regions = [Region(*row) for row in conn.execute("SELECT * FROM regions")]
+            rows = conn.execute("SELECT lat, lon, tags FROM pois").fetchall()
+            conn.close()
+            lats, lons, all_tags = [], [], []
+            cells: Dict[str, List[int]] = {}
+            postings: Dict[str, Set[int]] = {}
+            for i, (lat, lon, tags_json) in enumerate(rows):
+                tags = json.loads(tags_json)
+                lats.append(lat)
+                lons.append(lon)
+                all_tags.append(tags)
+                cells.setdefault(geohash(lat, lon), []).append(i)
+                for tag in INDEXED_TAGS:
+                    for token in tokenize(tags.get(tag, "")):
+                        postings.setdefault(token, set()).add(i)
+            self.regions = regions
+            self._lat, self._lon = np.array(lats, float), np.array(lons, float)
+            self._tags = all_tags
+            self._cells, self._postings = cells, postings
+            self._terms = sorted(postings)
+            self._loaded = True
+
+    def covers(self, lat: float, lon: float, radius: float) -> bool:
+        """True if the whole search circle lies inside an imported region."""
+        if not self.db_path:
+            return False
+        self._load()
+        box = bounding_box(lat, lon, radius)
+        return any(region.contains_box(*box) for region in self.regions)
+
+    def _cells_for(self, box: Tuple[float, ...]) -> Iterable[str]:
+        south, west, north, east = box
+        cell_lat, cell_lon = _cell_size(GEOHASH_PRECISION)
+        cells = set()
+        lat = south
+        while lat < north + cell_lat:
+            lon = west
+            while lon < east + cell_lon:
+                cells.add(geohash(min(lat, north), min(lon, east)))
+                lon += cell_lon
+            lat += cell_lat
+        return cells
+
+    def _prefixed(self, prefix: str) -> Set[int]:
+        found: Set[int] = set()
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            found |= self._postings[self._terms[i]]
+            i += 1
+        return found
+
+    def candidates(
+        self, query: str, lat: float, lon: float, radius: float
+    ) -> List[int]:
+        """
+        Indices of POIs matching every query token within the bounding box.
+        A token without an exact match matches as a word prefix ("pizz").
+        """
+        matches: Optional[Set[int]] = None
+        for token in tokenize(query):
+            posting = self._postings.get(token) or self._prefixed(token)
+            matches = posting if matches is None else matches & posting
+            if not matches:
+                return []
+        box = bounding_box(lat, lon, radius)
+        nearby = [i for cell in self._cells_for(box) for i in self._cells.get(cell, ())]
+        if matches is None:
+            return nearby
+        return [i for i in nearby if i in matches]
+
+    def search(
+        self, query: str, lat: float, lon: float, radius: float, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find POIs matching ``query`` within ``radius`` meters, best first.
+        Returns:
+            list: Overpass-style elements ({"lat", "lon", "tags"}), or None when
+            the area is not covered locally or nothing matched there, and the
+            caller should use Overpass (which also matches inside words).
+        """
+        if not self.covers(lat, lon, radius):
+            return None
+        idx = np.fromiter(self.candidates(query, lat, lon, radius), dtype=np.intp)
+        ranked = rank_candidates(
+            query,
+            lat,
+            lon,
+            radius,
+            limit,
+            self._lat[idx],
+            self._lon[idx],
+            [self._tags[i] for i in idx],
+        )
+        if not ranked:
+            return None
+        return [
+            {
+                "lat": float(self._lat[idx[j]]),
+                "lon": float(self._lon[idx[j]]),
+                "tags": self._tags[idx[j]],
+                "distance": distance,
+            }
+            for j, distance in ranked
+        ]
+
+
+poi_index = POIIndex(os.environ.get("TRAVEL_POI_DB"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Import an OSM extract into the offline POI store."
+    )
+    parser.add_argument("extract", help="Overpass/OSM JSON export or .pbf file")
+    parser.add_argument("--region", required=True, help="Region name, e.g. paris")
+    parser.add_argument(
+        "--bbox",
+        help="south,west,north,east covered by the extract (default: data extent)",
+    )
+    parser.add_argument(
+        "--db",
+        default=os.environ.get("TRAVEL_POI_DB"),
+        help="POI store path (default: $TRAVEL_POI_DB)",
+    )
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("--db or TRAVEL_POI_DB is required")
+    bbox = tuple(float(v) for v in args.bbox.split(",")) if args.bbox else None
+    count = import_extract(args.db, args.extract, args.region, bbox)
+    print(f"Imported {count} POIs for region '{args.region}' into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import re
+from typing import Any, AsyncIterable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# --- Place Ranking ---
+# Candidates from Overpass or the offline index are ranked by distance from
+# the search centre plus how well their name/category matches the query.
+# Distances are computed for all candidates at once with NumPy, and only the
+# best ``limit`` are fully sorted (argpartition), not the whole set.
+
+EARTH_RADIUS_M = 6371008.8
+MATCH_WEIGHT = 0.5  # how many radius-fractions of distance a full match is worth
+UNNAMED_PENALTY = 0.25
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with a naive plural strip ("cafes" -> "cafe")."""
+    tokens = []
+    for token in _TOKEN.findall(text.casefold()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def haversine_many(
+    lat: float, lon: float, lats: np.ndarray, lons: np.ndarray
+) -> np.ndarray:
+    """Great-circle distances in meters from (lat, lon) to every candidate."""
+    p1 = np.radians(lat)
+    p2 = np.radians(lats)
+    dp = p2 - p1
+    dl = np.radians(lons - lon)
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def match_score(query: str, query_tokens: frozenset, tags: Dict[str, str]) -> float:
+    """
+    0..1 relevance of a place to the query: full credit for name matches,
+    a little less for amenity/shop matches, some for a raw substring hit.
+    """
+    if not query_tokens:
+        return 0.0
+    name = tags.get("name", "")
+    name_hits = len(query_tokens.intersection(tokenize(name)))
+    category = (
+        f"{tags.get('amenity', '')} {tags.get('shop', '')} {tags.get('cuisine', '')}"
+    )
+    category_hits = len(query_tokens.intersection(tokenize(category)))
+    substring = 1.0 if query.casefold() in name.casefold() else 0.0
+    n = len(query_tokens)
+    return max(name_hits / n, 0.8 * category_hits / n, 0.5 * substring)
+
+
+def rank_candidates(
+    query: str,
+    lat: float,
+    lon: float,
+    radius: float,
+    limit: int,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    tags: Sequence[Dict[str, str]],
+) -> List[Tuple[int, float]]:
+    """
+    Rank candidates and return the best ``limit`` as (index, distance_m),
+    dropping anything outside ``radius``.
+    """
+    if len(lats) == 0 or limit <= 0:
+        return []
+    distances = haversine_many(lat, lon, lats, lons)
+    inside = np.flatnonzero(distances <= radius)
+    if inside.size == 0:
+        return []
+    query_tokens = frozenset(tokenize(query))
+    relevance = np.fromiter(
+        (match_score(query, query_tokens, tags[i]) for i in inside),
+        dtype=float,
+        count=inside.size,
+    )
+    unnamed = np.fromiter(
+        (not tags[i].get("name") for i in inside), dtype=bool, count=inside.size
+    )
+    scores = (
+        distances[inside] / max(radius, 1.0)
+        - MATCH_WEIGHT * relevance
+        + UNNAMED_PENALTY * unnamed
+    )
+    if inside.size > limit:
+        top = np.argpartition(scores, limit - 1)[:limit]
+    else:
+        top = np.arange(inside.size)
+    top = top[np.argsort(scores[top], kind="stable")]
+    return [(int(inside[i]), float(distances[inside[i]])) for i in top]
+
+
+def rank_elements(
+    elements: Iterable[Dict[str, Any]],
+    query: str,
+    lat: float,
+    lon: float,
+    radius: float,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Rank Overpass-style elements; each result gains a ``distance`` (m)."""
+    located = [el for el in elements if "lat" in el and "lon" in el]
+    if not located:
+        return []
+    lats = np.fromiter((el["lat"] for el in located), dtype=float, count=len(located))
+    lons = np.fromiter((el["lon"] for el in located), dtype=float, count=len(located))
+    tags = [el.get("tags") or {} for el in located]
+    ranked = rank_candidates(query, lat, lon, radius, limit, lats, lons, tags)
+    return [dict(located[i], distance=distance) for i, distance in ranked]
+
+
+# --- Streaming Overpass Parsing ---
+# ijson (optional) lets us decode "elements" one by one while the body is
+# still arriving and keep only the fields we rank on; without it the body is
+# buffered and parsed in one go.
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _slim(el: Dict[str, Any]) -> Dict[str, Any]:
+    slim = {"tags": el.get("tags") or {}}
+    if "lat" in el and "lon" in el:
+        slim["lat"], slim["lon"] = float(el["lat"]), float(el["lon"])
+    elif "center" in el:
+        slim["lat"] = float(el["center"]["lat"])
+        slim["lon"] = float(el["center"]["lon"])
+    return slim
+
+
+def parse_elements(chunks: Iterable[bytes]) -> List[Dict[str, Any]]:
+    """Decode Overpass ``elements`` from a byte-chunk iterator."""
+    if ijson is None:
+        body = json.loads(b"".join(chunks))
+        return [_slim(el) for el in body.get("elements", [])]
+    elements: List[Dict[str, Any]] = []
+    events = ijson.sendable_list()
+    coro = ijson.items_coro(events, "elements.item", use_float=True)
+    for chunk in chunks:
+        coro.send(chunk)
+        elements.extend(_slim(el) for el in events)
+        del events[:]
+    coro.close()
+    elements.extend(_slim(el) for el in events)
+    return elements
+
+
+async def parse_elements_async(chunks: AsyncIterable[bytes]) -> List[Dict[str, Any]]:
+    """Async variant of ``parse_elements`` for streamed httpx responses."""
+    if ijson is None:
+        body = json.loads(b"".join([chunk async for chunk in chunks]))
+        return [_slim(el) for el in body.get("elements", [])]
+    elements: List[Dict[str, Any]] = []
+    events = ijson.sendable_list()
+    coro = ijson.items_coro(events, "elements.item", use_float=True)
+    async for chunk in chunks:
+        coro.send(chunk)
+        elements.extend(_slim(el) for el in events)
+        del events[:]
+    coro.close()
+    elements.extend(_slim(el) for el in events)
+    return elements
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# --- Agent Registry ---
+# Agent trees are registered as factories and built on first use, so
+# importing the package stays cheap and google.adk, the tools and their
+# dependencies load only when an agent is actually needed. prewarm() builds
+# a tree in the background, e.g. while a server is still starting up.
+
+
+class AgentRegistry:
+    """Builds each registered agent once, on demand, and times the build."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._agents: Dict[str, Any] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._agents.pop(name, None)
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def get(self, name: str) -> Any:
+        """
+        Return the agent registered as ``name``, building it on first call.
+        Args:
+            name (str): Registered agent name.
+        Returns:
+            The built agent; concurrent callers all get the same instance.
+        """
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                if name not in self._factories:
+                    raise KeyError(f"No agent registered as '{name}'")
+                started = time.perf_counter()
+                agent = self._factories[name]()
+                self._build_seconds[name] = time.perf_counter() - started
+                self._agents[name] = agent
+        return agent
+
+    def prewarm(self, *names: str) -> threading.Thread:
+        """Build agents (default: all registered) in a daemon thread."""
+
+        def build():
+            for name in names or self.names():
+                self.get(name)
+
+        thread = threading.Thread(target=build, name="agent-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def build_report(self) -> Dict[str, Optional[float]]:
+        """Seconds each agent took to build (None if not built yet)."""
+        return {name: self._build_seconds.get(name) for name in self._factories}
+
+
+registry = AgentRegistry()
@@ -0,0 +1,218 @@
+import asyncio
+import math
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, FrozenSet, Optional, Sequence, Tuple
+
+from google.adk.tools import ToolContext
+from google.adk.tools.agent_tool import AgentTool
+
+from travel_planner.cache import TTLCache
+from travel_planner.tracing import annotate
+
+# --- Search Response Cache ---
+# Every google_search_grounding call runs a whole extra LLM + Google Search
+# round, and many users ask near-identical questions. Answers are cached
+# under a normalized query key; near-duplicates are matched by character
+# trigram similarity (or a caller-supplied embedding), but only when their
+# anchors -- every content word, up to plural forms, in order -- are
+# identical. Case says nothing in typed queries, so no word is assumed to be
+# filler: "metro strike line 1" never answers "line 14", "lisbon in august"
+# never answers "lisbon in april" and "Paris to London" never answers
+# "London to Paris". TTLs are short because news goes stale quickly.
+
+SEARCH_CACHE_TTL = float(os.environ.get("TRAVEL_SEARCH_CACHE_TTL", 15 * 60))
+# Queries about "today", "tonight", "latest"... expire sooner.
+TIME_SENSITIVE_TTL = float(os.environ.get("TRAVEL_SEARCH_CACHE_HOT_TTL", 5 * 60))
+SIMILARITY_THRESHOLD = float(os.environ.get("TRAVEL_SEARCH_CACHE_SIMILARITY", 0.85))
+
+_STOPWORDS = frozenset(
+    "a an the of in on at to for from and or is are was were be what whats "
+    "which who how any some there me my i we us you please tell show find "
+    "about with near around".split()
+)
+_TIME_SENSITIVE = frozenset(
+    "today tonight now latest breaking current currently live update updates".split()
+)
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a search query: lowercase, punctuation and stopwords
+    removed, repeated words dropped; word order is kept.
+    "What events are in Tokyo this weekend?" -> "events tokyo this weekend"
+    """
+    words = [w for w in _WORD.findall(query.casefold()) if w not in _STOPWORDS]
+    return " ".join(dict.fromkeys(words))
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def anchors(query: str) -> Tuple[str, ...]:
+    """
+    Words a near-duplicate must share exactly, in order: the normalized
+    query's words in singular form.
+    "Best restaurants in Lisbon in August" -> ("best", "restaurant", "lisbon", "august")
+    """
+    words = normalize_query(query).split()
+    return tuple(dict.fromkeys(_singular(w) for w in words))
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SearchResponseCache:
+    """
+    Size-bounded, TTL'd cache of search answers with near-duplicate lookup.
+    Args:
+        maxsize (int): Max cached answers (LRU-evicted).
+        ttl (float): Default freshness in seconds.
+        similarity_threshold (float): Min similarity for a near-duplicate hit.
+        embed (callable): Optional text -> vector function; when given, cosine
+            similarity of embeddings replaces trigram similarity.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = SEARCH_CACHE_TTL,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+    ):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _signature(self, key: str) -> Any:
+        return self.embed(key) if self.embed else trigrams(key)
+
+    def _similarity(self, a: Any, b: Any) -> float:
+        return _cosine(a, b) if self.embed else _jaccard(a, b)
+
+    def get(self, query: str) -> Optional[str]:
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+        if entry is not None:
+            with self._lock:
+                self.exact_hits += 1
+            annotate(search_cache="exact")
+            return entry[2]
+        if key:
+            signature = self._signature(key)
+            required = anchors(query)
+            best, best_score = None, self.similarity_threshold
+            for _, (other_signature, other_anchors, response) in self._entries.items():
+                if other_anchors != required:
+                    continue
+                score = self._similarity(signature, other_signature)
+                if score >= best_score:
+                    best, best_score = response, score
+            if best is not None:
+                with self._lock:
+                    self.similar_hits += 1
+                annotate(search_cache="similar", similarity=round(best_score, 3))
+                return best
+        with self._lock:
+            self.misses += 1
+        annotate(search_cache="miss")
+        return None
+
+    def put(self, query: str, response: str) -> None:
+        key = normalize_query(query)
+        ttl = TIME_SENSITIVE_TTL if _TIME_SENSITIVE.intersection(key.split()) else None
+        self._entries.set(
+            key, (self._signature(key), anchors(query), response), ttl=ttl
+        )
+        with self._lock:
+            self.stores += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self._entries.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedAgentTool(AgentTool):
+    """
+    AgentTool that answers repeated requests from a SearchResponseCache and
+    collapses identical concurrent requests into one agent run.
+    """
+
+    def __init__(self, agent, cache: SearchResponseCache, **kwargs: Any):
+        super().__init__(agent=agent, **kwargs)
+        self.cache = cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def run_async(
+        self, *, args: Dict[str, Any], tool_context: ToolContext
+    ) -> Any:
+        request = args.get("request")
+        if not isinstance(request, str):
+            return await super().run_async(args=args, tool_context=tool_context)
+        cached = self.cache.get(request)
+        if cached is not None:
+            return cached
+        key = normalize_query(request)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await super().run_async(args=args, tool_context=tool_context)
+            if isinstance(result, str) and result.strip():
+                self.cache.put(request, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; mark it retrieved for the no-waiter case.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+
+search_cache = SearchResponseCache()
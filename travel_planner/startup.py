@@ -0,0 +1,118 @@
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# --- Startup Report ---
+# Measures cold start in a fresh interpreter: how long importing the agent
+# module takes, how long building the agent tree takes on first access, and
+# which modules that time goes to (from ``python -X importtime``).
+#
+#   python -m travel_planner.startup --top 15
+
+_PROBE = """
+import importlib, json, sys, time
+module, attr = sys.argv[1], sys.argv[2]
+started = time.perf_counter()
+loaded = importlib.import_module(module)
+imported = time.perf_counter()
+if attr:
+    getattr(loaded, attr)
+built = time.perf_counter()
+print(json.dumps({"import_seconds": imported - started, "build_seconds": built - imported}))
+"""
+
+
+@dataclass
+class ModuleTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ModuleTime]:
+    """Parse ``-X importtime`` lines ("import time: self | cumulative | name")."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append(ModuleTime(name.strip(), int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+def measure(
+    module: str = "travel_planner.agent", attr: Optional[str] = "root_agent"
+) -> Dict[str, Any]:
+    """
+    Import ``module`` (and read ``attr``) in a fresh interpreter.
+    Returns:
+        dict: import_seconds, build_seconds and per-module ``modules`` rows.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module, attr or ""],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["modules"] = parse_importtime(proc.stderr)
+    return timings
+
+
+def by_package(rows: List[ModuleTime]) -> Dict[str, int]:
+    """Self import time (us) summed per top-level package, largest first."""
+    totals: Dict[str, int] = {}
+    for row in rows:
+        package = row.module.split(".")[0]
+        totals[package] = totals.get(package, 0) + row.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report cold-start import time.")
+    parser.add_argument("--module", default="travel_planner.agent")
+    parser.add_argument(
+        "--attr",
+        default="root_agent",
+        help="Attribute to read after import ('' to skip building the agent)",
+    )
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args(argv)
+
+    timings = measure(args.module, args.attr)
+    rows = timings.pop("modules")
+    packages = by_package(rows)
+    if args.json:
+        timings["packages_us"] = packages
+        timings["modules"] = [row.__dict__ for row in rows]
+        print(json.dumps(timings, indent=2))
+        return
+    print(f"import {args.module}: {timings['import_seconds'] * 1000:.1f} ms")
+    if args.attr:
+        print(f"first access to {args.attr}: {timings['build_seconds'] * 1000:.1f} ms")
+    print(f"\nself time by package (top {args.top}):")
+    for package, us in list(packages.items())[: args.top]:
+        print(f"  {us / 1000:>9.1f} ms  {package}")
+    print(f"\nslowest modules by cumulative time (top {args.top}):")
+    for row in sorted(rows, key=lambda r: r.cumulative_us, reverse=True)[: args.top]:
+        print(f"  {row.cumulative_us / 1000:>9.1f} ms  {row.module}")
+    own = [row for row in rows if row.module.startswith("travel_planner")]
+    print("\ntravel_planner modules:")
+    for row in sorted(own, key=lambda r: r.cumulative_us, reverse=True):
+        print(
+            f"  {row.cumulative_us / 1000:>9.1f} ms  "
+            f"(self {row.self_us / 1000:.1f} ms)  {row.module}"
+        )
+
+
+if __name__ == "__main__":
+    main()
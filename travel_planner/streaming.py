@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import contextvars
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+# --- Streaming Responses ---
+# A full plan only reaches the user once every specialist and the final
+# synthesis are done. In streaming mode each specialist result is pushed to
+# the client the moment its tool call returns, then the summary follows
+# (token by token when the model streams). Results travel over a per-request
+# queue held in a context variable: tool calls and fan-out branches run in
+# tasks copied from the request's context, so they find the right queue
+# without any session bookkeeping.
+#
+#   python -m travel_planner.streaming "Plan 4 days in Lisbon"
+#   python -m travel_planner.streaming --serve --port 8080   # POST /stream (SSE)
+
+APP_NAME = "travel_planner"
+
+# Tools whose results are not worth a partial: the fan-out tool streams its
+# branches individually, and agent transfers / feedback carry no content.
+UNSTREAMED_TOOLS = frozenset(
+    {"plan_trip_in_parallel", "transfer_to_agent", "submit_feedback"}
+)
+
+
+@dataclass
+class StreamEvent:
+    """
+    One message to the client.
+    Args:
+        kind (str): "session", "partial" (a specialist or tool result),
+            "delta" (a chunk of the summary), "final" (the full summary)
+            or "error".
+        source (str): Agent or tool that produced it.
+        text (str): Content.
+        status (str): "ok", "timeout" or "error" for partials.
+        elapsed_ms (float): Time since the request started.
+    """
+
+    kind: str
+    source: str
+    text: str
+    status: str = "ok"
+    elapsed_ms: float = 0.0
+
+    def to_sse(self) -> str:
+        return f"event: {self.kind}\ndata: {json.dumps(asdict(self))}\n\n"
+
+
+class _Channel:
+    def __init__(self):
+        self.queue: "asyncio.Queue[Optional[StreamEvent]]" = asyncio.Queue()
+        self.started = time.perf_counter()
+
+    def put(self, kind: str, source: str, text: str, status: str = "ok") -> None:
+        elapsed = round((time.perf_counter() - self.started) * 1000, 1)
+        self.queue.put_nowait(StreamEvent(kind, source, text, status, elapsed))
+
+
+_channel: contextvars.ContextVar[Optional[_Channel]] = contextvars.ContextVar(
+    "travel_stream_channel", default=None
+)
+
+
+def publish(source: str, result: Any, status: str = "ok") -> None:
+    """Send a specialist/tool result to the streaming client, if there is one."""
+    channel = _channel.get()
+    if channel is None:
+        return
+    if not isinstance(result, str):
+        result = json.dumps(result, default=str)
+    channel.put("partial", source, result, status)
+
+
+def publish_tool_result(
+    tool: Any, args: Dict[str, Any], tool_context: Any, tool_response: Any
+) -> None:
+    """after_tool_callback streaming each tool result as soon as it returns."""
+    if tool.name not in UNSTREAMED_TOOLS:
+        publish(tool.name, tool_response)
+    return None
+
+
+def _text(event: Any) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(p.text or "" for p in event.content.parts if not p.thought)
+
+
+async def _drive(
+    runner: Any,
+    user_id: str,
+    session_id: str,
+    message: str,
+    token_streaming: bool,
+    channel: _Channel,
+) -> None:
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.genai import types
+
+    run_config = RunConfig(
+        streaming_mode=StreamingMode.SSE if token_streaming else StreamingMode.NONE
+    )
+    try:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+            run_config=run_config,
+        ):
+            if event.error_code:
+                channel.put("error", event.author, event.error_message or "", "error")
+            elif event.partial:
+                text = _text(event)
+                if text:
+                    channel.put("delta", event.author, text)
+            elif event.is_final_response():
+                text = _text(event)
+                if text:
+                    channel.put("final", event.author, text)
+    except Exception as e:
+        channel.put("error", APP_NAME, f"❌ {str(e)}", "error")
+    finally:
+        channel.queue.put_nowait(None)
+
+
+class ResponseStreamer:
+    """
+    Runs the agent tree for one message and yields StreamEvents as results
+    become available.
+    Args:
+        runner: ADK Runner; defaults to an InMemoryRunner over root_agent,
+            built on first use.
+        app_name (str): App name for sessions created by the streamer.
+    """
+
+    def __init__(self, runner: Any = None, app_name: str = APP_NAME):
+        self._runner = runner
+        self.app_name = app_name
+
+    @property
+    def runner(self) -> Any:
+        if self._runner is None:
+            from google.adk.runners import InMemoryRunner
+
+            from travel_planner.agent import root_agent
+
+            self._runner = InMemoryRunner(agent=root_agent, app_name=self.app_name)
+        return self._runner
+
+    async def ensure_session(self, user_id: str, session_id: Optional[str]) -> str:
+        """Return ``session_id`` if it exists for the user, else a new session's id."""
+        sessions = self.runner.session_service
+        if session_id:
+            session = await sessions.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+            if session is not None:
+                return session.id
+        session = await sessions.create_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id or None
+        )
+        return session.id
+
+    async def stream(
+        self,
+        user_id: str,
+        message: str,
+        session_id: Optional[str] = None,
+        token_streaming: bool = True,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Answer ``message``: a "session" event first, then "partial" events as
+        specialists finish, "delta" chunks of the summary, and the "final"
+        summary. Closing the generator early cancels the run.
+        """
+        session_id = await self.ensure_session(user_id, session_id)
+        channel = _Channel()
+        yield StreamEvent("session", self.app_name, session_id)
+        # The task copies the current context, so the run sees the channel.
+        token = _channel.set(channel)
+        try:
+            producer = asyncio.create_task(
+                _drive(
+                    self.runner, user_id, session_id, message, token_streaming, channel
+                )
+            )
+        finally:
+            _channel.reset(token)
+        try:
+            while True:
+                event = await channel.queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+streamer = ResponseStreamer()
+
+
+def create_app(response_streamer: Optional[ResponseStreamer] = None) -> Any:
+    """
+    FastAPI app with ``POST /stream`` answering as server-sent events.
+    Body: {"user_id": str, "message": str, "session_id": str (optional),
+    "token_streaming": bool (optional)}. The agent tree is built in the
+    background at startup, so the first request does not pay for it.
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from pydantic import BaseModel
+
+    response_streamer = response_streamer or streamer
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # Importing the agent module registers its factory; building is lazy.
+        import travel_planner.agent  # noqa: F401
+        from travel_planner.registry import registry
+
+        registry.prewarm()
+        yield
+
+    app = FastAPI(title="Travel planner streaming API", lifespan=lifespan)
+
+    class StreamRequest(BaseModel):
+        user_id: str
+        message: str
+        session_id: Optional[str] = None
+        token_streaming: bool = True
+
+    @app.post("/stream")
+    async def stream(request: StreamRequest) -> StreamingResponse:
+        async def body() -> AsyncIterator[str]:
+            async for event in response_streamer.stream(
+                request.user_id,
+                request.message,
+                request.session_id,
+                request.token_streaming,
+            ):
+                yield event.to_sse()
+
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            # Stop proxies from buffering the stream.
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return app
+
+
+async def _print_stream(message: str, user_id: str, token_streaming: bool) -> None:
+    streamed = False
+    async for event in streamer.stream(
+        user_id, message, token_streaming=token_streaming
+    ):
+        if event.kind == "delta":
+            if not streamed:
+                print(f"\n[{event.elapsed_ms:>8.1f} ms] summary {event.source}:")
+                streamed = True
+            print(event.text, end="", flush=True)
+        elif event.kind == "final" and streamed:
+            print(f"\n[{event.elapsed_ms:>8.1f} ms] done", flush=True)
+        else:
+            print(f"\n[{event.elapsed_ms:>8.1f} ms] {event.kind} {event.source}:")
+            print(event.text, flush=True)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream a travel planner answer.")
+    parser.add_argument("message", nargs="?", help="Message to answer")
+    parser.add_argument("--user-id", default="cli-user")
+    parser.add_argument(
+        "--no-token-streaming",
+        action="store_true",
+        help="Send the summary in one piece instead of as deltas",
+    )
+    parser.add_argument("--serve", action="store_true", help="Run the SSE server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        import uvicorn
+
+        uvicorn.run(create_app(), host=args.host, port=args.port)
+    elif args.message:
+        asyncio.run(
+            _print_stream(args.message, args.user_id, not args.no_token_streaming)
+        )
+    else:
+        parser.error("give a message or --serve")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from google.adk.agents import Agent
+from google.adk.tools import FunctionTool, ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
 LLM = "gemini-2.5-flash-lite"
@@ -7,14 +8,21 @@ from travel_planner.tools import (
     google_search_grounding,
     location_search_tool,
     weather_tool,
+    weather_batch_tool,
     user_context_memory,
     feedback_tool,
     profile_update_tool,
     budget_tool,
+    budget_compare_tool,
     visa_tool,
+    visa_free_tool,
     local_events_tool,
     language_culture_tool,
 )
+from travel_planner.fanout import ParallelFanout
+from travel_planner.context import inject_user_context, record_user_turn
+from travel_planner.fast_path import count_direct_tool_calls, fast_path_callback
+from travel_planner.streaming import publish_tool_result
 
 # --- Budget Agent ---
 budget_agent = Agent(
@@ -22,9 +30,11 @@ budget_agent = Agent(
     name="budget_agent",
     description="Estimates total travel costs and provides budgeting tips for any trip.",
     instruction="""
-        You are a travel budget advisor. Ask the user for destination, trip duration, and number of travelers. Use the budget_tool to estimate total costs (flights, hotels, food, transport) and provide a clear breakdown. Offer practical tips to save money. If the user has a set budget, suggest ways to optimize their trip within that amount.
+        You are a travel budget advisor. Ask the user for destination, trip duration, and number of travelers. Use the budget_tool to estimate total costs (flights, hotels, food, transport, activities) and provide a clear breakdown; pass the travel month when known, since prices vary by season. Offer practical tips to save money. If the user has a set budget, suggest ways to optimize their trip within that amount.
+        - To compare several destinations (e.g., "which of these fit within $3000?"), call compare_destination_budgets once with all of them instead of estimating each separately.
     """,
-    tools=[budget_tool],
+    tools=[budget_tool, budget_compare_tool],
+    before_model_callback=inject_user_context,
 )
 
 # --- Visa Agent ---
@@ -34,8 +44,9 @@ visa_agent = Agent(
     description="Checks visa requirements for travelers based on nationality and destination.",
     instruction="""
         You are a visa requirements expert. Ask the user for their nationality and destination. Use the visa_tool to check if a visa is needed. Always recommend checking the official embassy website for the latest information. If requirements are unclear, provide guidance on where to find official details.
+        - When the user asks where they can travel without a visa, call find_visa_free_destinations with their nationality.
     """,
-    tools=[visa_tool],
+    tools=[visa_tool, visa_free_tool],
 )
 
 # --- Local Events Agent ---
@@ -44,7 +55,7 @@ local_events_agent = Agent(
     name="local_events_agent",
     description="Finds upcoming local events, festivals, and activities at the user's destination.",
     instruction="""
-        You are a local events specialist. Ask the user for their destination and travel dates. Use the local_events_tool to find relevant events, festivals, or activities. Present results in a clear, date-ordered list. If no events are found, suggest checking local tourism websites or apps.
+        You are a local events specialist. Ask the user for their destination and travel dates. Use the local_events_tool with start_date and end_date (YYYY-MM-DD) to find events, festivals, or activities on those days. Present results in a clear, date-ordered list. If the result says there are more pages, call the tool again with the next page when the user wants more. If no events are found, suggest checking local tourism websites or apps.
     """,
     tools=[local_events_tool],
 )
@@ -93,6 +104,7 @@ news_agent = Agent(
         - Encourage the user to provide feedback on the suggestions, and use the feedback_tool to collect it.
     """,
     tools=[google_search_grounding, feedback_tool],
+    before_model_callback=inject_user_context,
 )
 
 
@@ -111,6 +123,7 @@ places_agent = Agent(
         - Encourage the user to provide feedback on the suggestions, and use the feedback_tool to collect it.
     """,
     tools=[location_search_tool, feedback_tool],
+    before_model_callback=inject_user_context,
 )
 weather_agent = Agent(
     model=LLM,
@@ -118,16 +131,76 @@ weather_agent = Agent(
     description="Provides real-time weather forecasts for any location to help users plan their trips.",
     instruction="""
         You are a weather assistant. Use the weather_tool to provide up-to-date weather forecasts for the user's destination.
+        - When the user asks about several destinations (e.g., a multi-city trip), use the weather_batch_tool once with all of them instead of calling the weather_tool per city.
         - Always include temperature, precipitation, and any weather warnings.
         - If user travel dates are available (from context), provide weather for those dates.
         - If not, provide the next day's forecast.
         - Explain how the weather might impact travel plans (e.g., "Rain expected, so pack an umbrella.")
         - Encourage the user to provide feedback on the weather information, and use the feedback_tool to collect it.
     """,
-    tools=[weather_tool, feedback_tool],
+    tools=[weather_tool, weather_batch_tool, feedback_tool],
+    before_model_callback=inject_user_context,
 )
 
 
+specialist_tools = {
+    agent.name: AgentTool(agent=agent)
+    for agent in (
+        news_agent,
+        places_agent,
+        weather_agent,
+        budget_agent,
+        visa_agent,
+        local_events_agent,
+        language_culture_agent,
+    )
+}
+
+# --- Parallel Planning Tool ---
+specialist_fanout = ParallelFanout(specialist_tools)
+
+
+async def plan_trip_in_parallel(
+    tool_context: ToolContext,
+    news_request: str = "",
+    places_request: str = "",
+    weather_request: str = "",
+    budget_request: str = "",
+    visa_request: str = "",
+    local_events_request: str = "",
+    language_culture_request: str = "",
+) -> dict:
+    """
+    Ask several specialist agents at the same time and return all their answers together.
+    Fill in a request only for the specialists you need; leave the others empty.
+    Args:
+        news_request (str): Request for the news_agent (current events, travel news).
+        places_request (str): Request for the places_agent (places to visit, near a landmark).
+        weather_request (str): Request for the weather_agent (destination and dates).
+        budget_request (str): Request for the budget_agent (destination, days, travelers).
+        visa_request (str): Request for the visa_agent (nationality and destination).
+        local_events_request (str): Request for the local_events_agent (destination and dates).
+        language_culture_request (str): Request for the language_culture_agent (destination).
+    Returns:
+        dict: For each specialist asked, its status ("ok", "timeout", "error") and result.
+    """
+    return await specialist_fanout.run(
+        {
+            "news_agent": news_request,
+            "places_agent": places_request,
+            "weather_agent": weather_request,
+            "budget_agent": budget_request,
+            "visa_agent": visa_request,
+            "local_events_agent": local_events_request,
+            "language_culture_agent": language_culture_request,
+        },
+        tool_context,
+    )
+
+
+parallel_planning_tool = FunctionTool(func=plan_trip_in_parallel)
+
+
 travel_inspiration_agent = Agent(
     model=LLM,
     name="travel_inspiration_agent",
@@ -141,6 +214,8 @@ travel_inspiration_agent = Agent(
         - Use the visa_agent to check visa requirements for the user's nationality and destination.
         - Use the local_events_agent to find events and festivals during the user's travel dates.
         - Use the language_culture_agent to provide key phrases and etiquette tips for the destination.
+        - For straightforward budget, visa, event, or phrase/etiquette lookups, call calculate_budget, compare_destination_budgets (several destinations at once), check_visa_requirement, find_visa_free_destinations, find_local_events, or get_language_culture_tips directly; use the budget_agent, visa_agent, local_events_agent, or language_culture_agent only for open-ended advice on those topics.
+        - When a request needs two or more of these specialists (e.g., a full trip plan), call plan_trip_in_parallel once with a request for each specialist instead of calling them one by one, then merge their answers. If a specialist timed out or failed, work with the others' results.
         - When user context (preferences, history, feedback) is available, personalize all suggestions accordingly.
         - When asked for general knowledge, provide concise, engaging facts that connect back to actionable travel ideas.
         - Always relate your answers to helping the user plan a memorable trip.
@@ -151,13 +226,20 @@ travel_inspiration_agent = Agent(
         - Encourage the user to provide feedback on the overall recommendations, and use the feedback_tool to collect it.
     """,
     tools=[
-        AgentTool(agent=news_agent),
-        AgentTool(agent=places_agent),
-        AgentTool(agent=weather_agent),
-        AgentTool(agent=budget_agent),
-        AgentTool(agent=visa_agent),
-        AgentTool(agent=local_events_agent),
-        AgentTool(agent=language_culture_agent),
+        *specialist_tools.values(),
+        parallel_planning_tool,
+        budget_tool,
+        budget_compare_tool,
+        visa_tool,
+        visa_free_tool,
+        local_events_tool,
+        language_culture_tool,
         feedback_tool,
     ],
+    before_model_callback=[
+        record_user_turn,
+        fast_path_callback,
+        inject_user_context,
+    ],
+    after_tool_callback=[count_direct_tool_calls, publish_tool_result],
 )
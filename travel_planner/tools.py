@@ -1,67 +1,347 @@
 from google.adk.tools import FunctionTool
 
-
 # --- Budget Calculation Tool ---
+_SEASON_LABELS = {
+    "low": "low season",
+    "shoulder": "shoulder season",
+    "high": "high season",
+}
+_TIER_LABELS = {"low": "low-cost", "mid": "mid-range", "high": "luxury"}
+_TIER_TIPS = {
+    "low": "Tip: Hostels, guesthouses and street food keep costs down; book flights early.",
+    "mid": "Tip: Book in advance and compare prices for savings.",
+    "high": "Tip: Book premium rooms and experiences early; they sell out in high season.",
+}
+
+
+def _money(amount: float) -> str:
+    return f"${amount:,.0f}"
+
+
 def calculate_budget(
-    user_id: str, destination: str, days: int, travelers: int = 1
+    user_id: str,
+    destination: str,
+    days: int,
+    travelers: int = 1,
+    travel_month: int = None,
 ) -> str:
     """
     Estimate travel budget based on destination, days, and number of travelers.
-    (Uses static average costs; can be extended with real APIs.)
+    Uses per-destination, per-season average costs, scaled to the budget tier
+    (low / mid / high) in the user's profile.
+
+    Args:
+        user_id (str): User whose profile budget tier is used.
+        destination (str): City or country.
+        days (int): Trip length in days.
+        travelers (int): Number of travelers (default: 1).
+        travel_month (int): Month of travel, 1-12, if known (prices vary by season).
+
+    Returns:
+        str: Cost breakdown and total, formatted for user display.
     """
-    # Example static costs (USD)
-    avg_flight = 500
-    avg_hotel_per_night = 100
-    avg_food_per_day = 40
-    avg_transport_per_day = 20
-    total = (
-        avg_flight * travelers
-        + avg_hotel_per_night * days * travelers
-        + avg_food_per_day * days * travelers
-        + avg_transport_per_day * days * travelers
-    )
-    return (
-        f"Estimated budget for {travelers} traveler(s) to {destination} for {days} days:\n"
-        f"- Flights: ${avg_flight * travelers}\n"
-        f"- Hotels: ${avg_hotel_per_night * days * travelers}\n"
-        f"- Food: ${avg_food_per_day * days * travelers}\n"
-        f"- Local Transport: ${avg_transport_per_day * days * travelers}\n"
-        f"- Total: ${total} (estimate)\n"
-        "Tip: Book in advance and compare prices for savings."
-    )
+    # NumPy and the cost table load on the first budget question.
+    from travel_planner.budget import ANY_SEASON, SEASONS, TIERS, cost_table, tier_index
+
+    if days < 1 or travelers < 1:
+        return "❌ Days and travelers must both be at least 1."
+    try:
+        tier = TIERS[tier_index(user_context_memory.get_profile(user_id).budget)]
+        estimate = cost_table().estimate_many(
+            [destination], days, travelers, tier, travel_month
+        )
+    except Exception as e:
+        return f"❌ Error estimating the budget for {destination}: {str(e)}"
+    flights, hotels, food, transport, activities = estimate.breakdown[0]
+    season = int(estimate.season[0])
+    when = "" if season == ANY_SEASON else f", {_SEASON_LABELS[SEASONS[season]]}"
+    nights = max(days - 1, 1)
+    rooms = -(-travelers // 2)
+    lines = [
+        f"Estimated {_TIER_LABELS[tier.value]} budget for {travelers} traveler(s) "
+        f"to {destination} for {days} days{when}:",
+        f"- Flights: {_money(flights)}",
+        f"- Hotels: {_money(hotels)} ({nights} night(s), {rooms} room(s))",
+        f"- Food: {_money(food)}",
+        f"- Local Transport: {_money(transport)}",
+        f"- Activities: {_money(activities)}",
+        f"- Total: {_money(estimate.total[0])} (estimate)",
+    ]
+    if not estimate.found[0]:
+        lines.append(
+            f"ℹ️ No cost data for {destination}; typical destination prices were used."
+        )
+    lines.append(_TIER_TIPS[tier.value])
+    return "\n".join(lines)
 
 
 budget_tool = FunctionTool(func=calculate_budget)
 
 
+def compare_destination_budgets(
+    user_id: str,
+    destinations: list[str],
+    days: int,
+    travelers: int = 1,
+    max_budget: float = None,
+    travel_month: int = None,
+) -> str:
+    """
+    Compare estimated trip costs for several destinations at once, cheapest first.
+    Use this instead of calling calculate_budget once per destination.
+
+    Args:
+        user_id (str): User whose profile budget tier is used.
+        destinations (list[str]): Cities or countries to compare.
+        days (int): Trip length in days.
+        travelers (int): Number of travelers (default: 1).
+        max_budget (float): Total budget in USD; destinations over it are flagged.
+        travel_month (int): Month of travel, 1-12, if known.
+
+    Returns:
+        str: Ranked totals, formatted for user display.
+    """
+    from travel_planner.budget import TIERS, cost_table, tier_index
+
+    if not destinations:
+        return "❌ Please provide at least one destination to compare."
+    if days < 1 or travelers < 1:
+        return "❌ Days and travelers must both be at least 1."
+    try:
+        tier = TIERS[tier_index(user_context_memory.get_profile(user_id).budget)]
+        estimate = cost_table().estimate_many(
+            destinations, days, travelers, tier, travel_month
+        )
+    except Exception as e:
+        return f"❌ Error comparing budgets: {str(e)}"
+    lines = [
+        f"Estimated {_TIER_LABELS[tier.value]} totals for {travelers} traveler(s), "
+        f"{days} days:"
+    ]
+    within = 0
+    for rank, i in enumerate(estimate.total.argsort(kind="stable"), start=1):
+        total = estimate.total[i]
+        line = f"{rank}. {destinations[i]}: {_money(total)}"
+        if max_budget is not None:
+            fits = total <= max_budget
+            within += fits
+            line += (
+                " ✅ within budget"
+                if fits
+                else f" ⚠️ {_money(total - max_budget)} over"
+            )
+        if not estimate.found[i]:
+            line += " (no cost data; typical prices)"
+        lines.append(line)
+    if max_budget is not None:
+        lines.append(
+            f"{within} of {len(destinations)} destinations fit within {_money(max_budget)}."
+        )
+    return "\n".join(lines)
+
+
+budget_compare_tool = FunctionTool(func=compare_destination_budgets)
+
+
 # --- Visa Check Tool ---
+_VISA_VERIFY = "Always confirm with the destination's official embassy or immigration website before travel."
+
+
+def _stay(days: int) -> str:
+    return "" if not days else f" for up to {days} days"
+
+
+def _describe_visa(rule) -> str:
+    who = f"{rule.passport.demonym or rule.passport.name} citizens"
+    where = rule.destination.name
+    if rule.requirement == "citizen":
+        return (
+            f"{rule.passport.name} citizens do not need a visa for their own country."
+        )
+    text = {
+        "visa_free": f"✅ No visa required for {who} visiting {where}{_stay(rule.max_stay_days)}.",
+        "visa_on_arrival": f"🛬 {who} can get a visa on arrival in {where}{_stay(rule.max_stay_days)}.",
+        "eta": f"📝 No visa required for {who} visiting {where}{_stay(rule.max_stay_days)}, but an electronic travel authorization must be obtained before departure.",
+        "e_visa": f"💻 {who} need a visa for {where}, which can be applied for online (e-visa){_stay(rule.max_stay_days)}.",
+        "visa_required": f"🛂 {who} need a visa for {where}; apply at the embassy or consulate well before travel.",
+    }.get(rule.requirement)
+    if text is None:
+        return f"ℹ️ No visa rule on file for {who} visiting {where}. {_VISA_VERIFY}"
+    if rule.note:
+        text += f" ({rule.note})"
+    return f"{text}\n{_VISA_VERIFY}"
+
+
 def check_visa_requirement(nationality: str, destination: str) -> str:
     """
-    Check visa requirements (static demo; extend with real API for production).
+    Check visa requirements for a short tourist stay from the local visa rules database.
+
+    Args:
+        nationality (str): Passport country, ISO code or demonym (e.g., "US", "American", "United States").
+        destination (str): Destination country or ISO code.
+
+    Returns:
+        str: Visa requirement and allowed stay, formatted for user display.
     """
-    # Example: US citizens to France = no visa for short stays
-    if nationality.lower() == "us" and destination.lower() == "france":
-        return "No visa required for US citizens visiting France for up to 90 days."
-    return f"Visa requirements for {nationality} to {destination}: Please check the official embassy website for up-to-date information."
+    # NumPy and the rules matrix load on the first visa question.
+    from travel_planner.visa import visa_rules
+
+    try:
+        rules = visa_rules.rules()
+    except Exception as e:
+        return f"❌ Visa rules are unavailable: {str(e)}"
+    rule = rules.lookup(nationality, destination)
+    if rule is None:
+        unknown = nationality if rules.resolve(nationality) is None else destination
+        return f"❌ Could not recognise the country '{unknown}'. Please use a country name or ISO code."
+    return _describe_visa(rule)
 
 
 visa_tool = FunctionTool(func=check_visa_requirement)
 
 
+def find_visa_free_destinations(
+    nationality: str,
+    include_visa_on_arrival: bool = False,
+    include_eta: bool = False,
+) -> str:
+    """
+    List every destination a passport can visit without applying for a visa in advance.
+
+    Args:
+        nationality (str): Passport country, ISO code or demonym.
+        include_visa_on_arrival (bool): Also list visa-on-arrival destinations.
+        include_eta (bool): Also list destinations needing only an electronic travel authorization.
+
+    Returns:
+        str: Destinations grouped by requirement, longest allowed stay first.
+    """
+    from travel_planner.visa import visa_rules
+
+    requirements = ["visa_free"]
+    if include_visa_on_arrival:
+        requirements.append("visa_on_arrival")
+    if include_eta:
+        requirements.append("eta")
+    try:
+        all_rules = visa_rules.rules()
+        rules = all_rules.destinations(nationality, requirements)
+    except Exception as e:
+        return f"❌ Visa rules are unavailable: {str(e)}"
+    if rules is None:
+        return f"❌ Could not recognise the country '{nationality}'. Please use a country name or ISO code."
+    # The rules database is not exhaustive; say how much is missing so the
+    # list is not read as complete.
+    unknown = all_rules.unknown_destinations(nationality)
+    coverage = (
+        f"ℹ️ This lists known rules only: {unknown} of {len(all_rules.countries) - 1} "
+        "destinations have no rule on file for this passport, and some of them may also be visa-free."
+        if unknown
+        else ""
+    )
+    if not rules:
+        return "\n".join(
+            line
+            for line in (
+                f"ℹ️ No visa-free destinations on file for {nationality} passport holders.",
+                coverage,
+                _VISA_VERIFY,
+            )
+            if line
+        )
+    labels = {
+        "visa_free": "Visa-free",
+        "visa_on_arrival": "Visa on arrival",
+        "eta": "Electronic travel authorization only",
+    }
+    passport = rules[0].passport
+    lines = [f"Destinations for {passport.demonym or passport.name} passport holders:"]
+    for requirement in requirements:
+        matching = [r for r in rules if r.requirement == requirement]
+        if matching:
+            places = ", ".join(
+                f"{r.destination.name}{'' if not r.max_stay_days else f' ({r.max_stay_days}d)'}"
+                for r in matching
+            )
+            lines.append(f"- {labels[requirement]} ({len(matching)}): {places}")
+    if coverage:
+        lines.append(coverage)
+    lines.append(_VISA_VERIFY)
+    return "\n".join(lines)
+
+
+visa_free_tool = FunctionTool(func=find_visa_free_destinations)
+
+
 # --- Local Events Tool ---
+from datetime import date, datetime, timedelta
+
+
+def _event_when(start: datetime, end: datetime) -> str:
+    """Event time as a single date, date and time, or date range."""
+    all_day = start.time() == end.time() == datetime.min.time()
+    last_day = (end - timedelta(days=1)).date() if all_day else end.date()
+    if last_day > start.date():
+        return f"{start.date()} → {last_day}"
+    return str(start.date()) if all_day else start.strftime("%Y-%m-%d %H:%M")
+
+
 def find_local_events(
-    destination: str, start_date: str = None, end_date: str = None
+    destination: str, start_date: str = None, end_date: str = None, page: int = 1
 ) -> str:
     """
-    Find local events (static demo; extend with real API for production).
+    Find events at a destination between two dates from the ingested event feeds.
+
+    Args:
+        destination (str): City or place name.
+        start_date (str, optional): First day, YYYY-MM-DD (defaults to today).
+        end_date (str, optional): Last day, YYYY-MM-DD (defaults to 30 days after start_date).
+        page (int): Result page to return (1-based), for destinations with many events.
+
+    Returns:
+        str: Date-ordered list of events, formatted for user display.
     """
-    # Example static events
-    events = [
-        "Food Festival - Central Park, July 10-12",
-        "Jazz Night - Downtown Club, July 11",
-        "Art Market - Main Square, July 12-13",
-    ]
-    return f"Upcoming events in {destination}:\n" + "\n".join(events)
+    from travel_planner.events import DEFAULT_WINDOW_DAYS, event_store
+
+    try:
+        start = date.fromisoformat(start_date) if start_date else date.today()
+        end = (
+            date.fromisoformat(end_date)
+            if end_date
+            else start + timedelta(days=DEFAULT_WINDOW_DAYS)
+        )
+    except ValueError:
+        return "❌ Dates must be in YYYY-MM-DD format."
+    if end < start:
+        return "❌ end_date must be on or after start_date."
+    try:
+        result = event_store.search(destination, start, end, page=int(page or 1))
+    except Exception as e:
+        return f"❌ Error fetching events: {str(e)}"
+    if not result.total:
+        return f"ℹ️ No events on file for {destination} between {start} and {end}."
+    if not result.events:
+        return f"ℹ️ There are only {result.pages} page(s) of events for {destination}."
+    lines = [f"Events in {destination} from {start} to {end}:"]
+    for event in result.events:
+        line = f"- {_event_when(event.start, event.end)}: {event.title}"
+        if event.venue:
+            line += f" @ {event.venue}"
+        if event.category:
+            line += f" [{event.category}]"
+        if event.url:
+            line += f" ({event.url})"
+        lines.append(line)
+    if result.pages > 1:
+        lines.append(
+            f"Page {result.page} of {result.pages} ({result.total} events)."
+            + (
+                f" Ask for page {result.page + 1} for more."
+                if result.page < result.pages
+                else ""
+            )
+        )
+    return "\n".join(lines)
 
 
 local_events_tool = FunctionTool(func=find_local_events)
@@ -84,7 +364,8 @@ def get_language_culture_tips(destination: str, language: str = None) -> str:
 language_culture_tool = FunctionTool(func=get_language_culture_tips)
 from google.adk.tools.google_search_tool import google_search
 from google.adk.agents import Agent
-from google.adk.tools.agent_tool import AgentTool
+
+from travel_planner.search_cache import CachedAgentTool, search_cache
 
 
 # --- Profile Update Tool ---
@@ -141,62 +422,110 @@ _search_agent = Agent(
     tools=[google_search],
 )
 
-google_search_grounding = AgentTool(agent=_search_agent)
+# Near-identical news/events questions are answered from the search cache
+# instead of re-running the search agent.
+google_search_grounding = CachedAgentTool(agent=_search_agent, cache=search_cache)
 
 
 from google.adk.tools import FunctionTool
-from geopy.geocoders import Nominatim
+import asyncio
+import httpx
+import os
 import requests
-from typing import Dict, Any, Optional
-
+from typing import Callable, Dict, Any, List, Optional
+
+from travel_planner.geocoding import GeoPoint, geocode, geocode_async
+from travel_planner.http_client import get_async_client, get_sync_session
+from travel_planner.user_record import Profile, UserRecord
+from travel_planner.user_store import InMemoryUserStore, SQLiteUserStore, UserStore
+from travel_planner.weather_cache import (
+    FORECAST_HORIZON_DAYS,
+    DayForecast,
+    coord_key,
+    forecast_cache,
+)
 
 # --- User Context Memory (Simple Example) ---
 
 
 class UserContextMemory:
     """
-    Enhanced in-memory user context for demo purposes.
-    Stores profile, preferences, history, and feedback for personalization.
+    User context for personalization: profile, preferences, history, and feedback.
+    Storage is delegated to a UserStore backend (in-memory by default, SQLite
+    when TRAVEL_USER_STORE_DB points at a database file).
     """
 
-    def __init__(self):
-        self.user_data: Dict[str, Dict[str, Any]] = {}
-
-    def get(self, user_id: str) -> Dict[str, Any]:
-        return self.user_data.setdefault(
-            user_id,
-            {
-                "profile": {
-                    "activities": [],  # e.g., ["adventure", "culture", "food"]
-                    "budget": None,  # e.g., "low", "mid", "high"
-                    "style": None,  # e.g., "relaxation", "adventure", "family"
-                    "age_group": None,  # e.g., "18-25", "26-40", etc.
-                },
-                "preferences": {},
-                "history": [],
-                "feedback": [],
-            },
-        )
+    def __init__(self, store: Optional[UserStore] = None):
+        self.store = store or _default_user_store()
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    def subscribe(self, listener: Callable[[str, str], None]) -> None:
+        """Call ``listener(user_id, section)`` after every write."""
+        self._listeners.append(listener)
+
+    def _changed(self, user_id: str, section: str) -> None:
+        for listener in self._listeners:
+            listener(user_id, section)
+
+    def get(self, user_id: str) -> UserRecord:
+        return self.store.load(user_id)
 
     def update_profile(self, user_id: str, profile_updates: Dict[str, Any]):
-        self.get(user_id)["profile"].update(profile_updates)
+        self.store.update_profile(user_id, profile_updates)
+        self._changed(user_id, "profile")
 
-    def get_profile(self, user_id: str) -> Dict[str, Any]:
-        return self.get(user_id)["profile"]
+    def get_profile(self, user_id: str) -> Profile:
+        return self.get(user_id).profile
 
     def update_preferences(self, user_id: str, preferences: Dict[str, Any]):
-        self.get(user_id)["preferences"].update(preferences)
+        self.store.update_preferences(user_id, preferences)
+        self._changed(user_id, "preferences")
 
     def add_history(self, user_id: str, query: str):
-        self.get(user_id)["history"].append(query)
+        self.store.append_history(user_id, query)
+        self._changed(user_id, "history")
 
     def add_feedback(self, user_id: str, feedback: str):
-        self.get(user_id)["feedback"].append(feedback)
+        self.store.append_feedback(user_id, feedback)
+        self._changed(user_id, "feedback")
+
+    def memory_report(self) -> Dict[str, Any]:
+        return self.store.memory_report()
+
+
+def _default_user_store() -> UserStore:
+    path = os.environ.get("TRAVEL_USER_STORE_DB")
+    return SQLiteUserStore(path) if path else InMemoryUserStore()
 
 
 user_context_memory = UserContextMemory()
 
 
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+
+def _weather_params(lat: float, lon: float, days: int) -> Dict[str, Any]:
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode",
+        "forecast_days": days,
+        "timezone": "auto",
+    }
+
+
+def _format_weather(location: str, days: int, rows: List[DayForecast]) -> str:
+    if not rows:
+        return "ℹ️ No weather data available."
+    summary = [f"Weather for {location} (next {days} day{'s' if days > 1 else ''}):"]
+    for i, row in enumerate(rows[:days]):
+        summary.append(
+            f"- Day {i+1}: High {row.temp_max}°C, Low {row.temp_min}°C, Precipitation: {row.precipitation}mm"
+        )
+    return "\n".join(summary)
+
+
 def get_weather_forecast(location: str, days: int = 1) -> str:
     """
     Fetches weather forecast for a location using Open-Meteo API.
@@ -207,36 +536,170 @@ def get_weather_forecast(location: str, days: int = 1) -> str:
         str: Weather summary or error message.
     """
     try:
-        geolocator = Nominatim(user_agent="weather_agent")
-        loc = geolocator.geocode(location)
+        loc = geocode(location)
         if not loc:
             return f"❌ Could not find location '{location}' for weather."
-        lat, lon = loc.latitude, loc.longitude
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&daily=temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode&forecast_days={days}&timezone=auto"
-        resp = requests.get(url, timeout=10)
-        if resp.status_code != 200:
-            return f"❌ Weather API error: {resp.status_code}"
-        data = resp.json().get("daily", {})
-        if not data:
-            return "ℹ️ No weather data available."
-        temps_max = data.get("temperature_2m_max", [])
-        temps_min = data.get("temperature_2m_min", [])
-        precip = data.get("precipitation_sum", [])
-        summary = [
-            f"Weather for {location} (next {days} day{'s' if days > 1 else ''}):"
-        ]
-        for i in range(min(days, len(temps_max))):
-            summary.append(
-                f"- Day {i+1}: High {temps_max[i]}°C, Low {temps_min[i]}°C, Precipitation: {precip[i]}mm"
+        lat, lon = coord_key(loc.latitude, loc.longitude)
+        days = max(1, min(days, FORECAST_HORIZON_DAYS))
+        rows = forecast_cache.get(lat, lon, days)
+        if rows is None:
+            # Fetch the whole horizon once so later requests for any number
+            # of days at this place are served from the cache.
+            resp = get_sync_session().get(
+                OPEN_METEO_URL,
+                params=_weather_params(lat, lon, FORECAST_HORIZON_DAYS),
+                timeout=10,
             )
-        return "\n".join(summary)
+            if resp.status_code != 200:
+                return f"❌ Weather API error: {resp.status_code}"
+            rows = forecast_cache.put(lat, lon, resp.json())
+        return _format_weather(location, days, rows)
     except requests.Timeout:
         return "❌ Weather request timed out."
     except Exception as e:
         return f"❌ Error fetching weather: {str(e)}"
 
 
-weather_tool = FunctionTool(func=get_weather_forecast)
+async def get_weather_forecast_async(location: str, days: int = 1) -> str:
+    """
+    Fetches weather forecast for a location using Open-Meteo API.
+    Args:
+        location (str): City or place name.
+        days (int): Number of days to forecast (default: 1).
+    Returns:
+        str: Weather summary or error message.
+    """
+    try:
+        loc = await geocode_async(location)
+        if not loc:
+            return f"❌ Could not find location '{location}' for weather."
+        lat, lon = coord_key(loc.latitude, loc.longitude)
+        days = max(1, min(days, FORECAST_HORIZON_DAYS))
+        rows = forecast_cache.get(lat, lon, days)
+        if rows is None:
+            resp = await get_async_client().get(
+                OPEN_METEO_URL,
+                params=_weather_params(lat, lon, FORECAST_HORIZON_DAYS),
+                timeout=10,
+            )
+            if resp.status_code != 200:
+                return f"❌ Weather API error: {resp.status_code}"
+            rows = forecast_cache.put(lat, lon, resp.json())
+        return _format_weather(location, days, rows)
+    except httpx.TimeoutException:
+        return "❌ Weather request timed out."
+    except Exception as e:
+        return f"❌ Error fetching weather: {str(e)}"
+
+
+# Agents use the async variant so weather lookups never block the event loop.
+weather_tool = FunctionTool(func=get_weather_forecast_async)
+
+
+# --- Batch Weather Tool ---
+# Open-Meteo accepts comma-separated coordinate lists and answers with one
+# forecast per coordinate, so a multi-city trip needs a single request.
+BATCH_WEATHER_MAX_COORDS = 50  # keeps the request URL comfortably short
+
+
+async def _fetch_forecasts(coords: List[tuple]) -> None:
+    for start in range(0, len(coords), BATCH_WEATHER_MAX_COORDS):
+        chunk = coords[start : start + BATCH_WEATHER_MAX_COORDS]
+        params = _weather_params(0, 0, FORECAST_HORIZON_DAYS)
+        params["latitude"] = ",".join(str(lat) for lat, _ in chunk)
+        params["longitude"] = ",".join(str(lon) for _, lon in chunk)
+        resp = await get_async_client().get(OPEN_METEO_URL, params=params, timeout=20)
+        if resp.status_code != 200:
+            raise RuntimeError(f"Weather API error: {resp.status_code}")
+        payloads = resp.json()
+        if isinstance(payloads, dict):  # single coordinate -> single object
+            payloads = [payloads]
+        for (lat, lon), payload in zip(chunk, payloads):
+            forecast_cache.put(lat, lon, payload)
+
+
+async def get_weather_forecast_batch(locations: List[str], days: int = 1) -> str:
+    """
+    Fetches weather forecasts for several locations at once (e.g., every city of a multi-city trip).
+    Args:
+        locations (list[str]): City or place names.
+        days (int): Number of days to forecast for each location (default: 1).
+    Returns:
+        str: One weather summary per location, or an error message for that location.
+    """
+    if not locations:
+        return "ℹ️ No locations given for weather."
+    days = max(1, min(days, FORECAST_HORIZON_DAYS))
+    try:
+        points = await asyncio.gather(
+            *(geocode_async(location) for location in locations),
+            return_exceptions=True,
+        )
+        missing = []
+        for point in points:
+            if isinstance(point, GeoPoint):
+                key = coord_key(point.latitude, point.longitude)
+                if forecast_cache.get(*key, days) is None and key not in missing:
+                    missing.append(key)
+        if missing:
+            await _fetch_forecasts(missing)
+    except httpx.TimeoutException:
+        return "❌ Weather request timed out."
+    except Exception as e:
+        return f"❌ Error fetching weather: {str(e)}"
+
+    summaries = []
+    for location, point in zip(locations, points):
+        if isinstance(point, Exception):
+            summaries.append(f"❌ Error finding '{location}': {str(point)}")
+        elif point is None:
+            summaries.append(f"❌ Could not find location '{location}' for weather.")
+        else:
+            rows = forecast_cache.get(*coord_key(point.latitude, point.longitude), days)
+            summaries.append(_format_weather(location, days, rows or []))
+    return "\n\n".join(summaries)
+
+
+weather_batch_tool = FunctionTool(func=get_weather_forecast_batch)
+
+
+# Overpass truncates before we can rank, so ask for a generous candidate set
+# and let rank_elements pick the best ``limit`` by distance and name match.
+OVERPASS_MAX_CANDIDATES = 1000
+
+
+def _overpass_query(query: str, lat: float, lon: float, radius: int) -> str:
+    return f"""
+        [out:json][timeout:25];
+        (
+          node["name"~"{query}", i](around:{radius},{lat},{lon});
+          node["amenity"~"{query}", i](around:{radius},{lat},{lon});
+          node["shop"~"{query}", i](around:{radius},{lat},{lon});
+        );
+        out body qt {OVERPASS_MAX_CANDIDATES};
+        """
+
+
+def _format_places(query: str, location: str, elements: list, limit: int) -> str:
+    if not elements:
+        return f"ℹ️ No results found for '{query}' near {location}. Try a different keyword or location."
+
+    output = [f"Top {min(limit, len(elements))} results for '{query}' near {location}:"]
+    for el in elements[:limit]:
+        name = el.get("tags", {}).get("name", "Unnamed place")
+        street = el.get("tags", {}).get("addr:street", "")
+        city = el.get("tags", {}).get("addr:city", "")
+        country = el.get("tags", {}).get("addr:country", "")
+        lat = el.get("lat", None)
+        lon = el.get("lon", None)
+        full_addr = ", ".join(filter(None, [street, city, country]))
+        coords = f" (Lat: {lat:.5f}, Lon: {lon:.5f})" if lat and lon else ""
+        distance = el.get("distance")
+        away = f" | {distance / 1000:.1f} km away" if distance is not None else ""
+        output.append(
+            f"- {name}{coords} | {full_addr if full_addr else 'Address not available'}{away}"
+        )
+    return "\n".join(output)
 
 
 def find_nearby_places_open(
@@ -254,54 +717,84 @@ def find_nearby_places_open(
     Returns:
         str: List of matching place names and addresses, formatted for user display.
     """
+    # NumPy (and ijson) load on the first places search, not at startup.
+    from travel_planner.poi_index import poi_index
+    from travel_planner.ranking import parse_elements, rank_elements
+
     try:
-        geolocator = Nominatim(user_agent="open_place_finder_modern")
-        loc = geolocator.geocode(location)
+        loc = geocode(location)
         if not loc:
             return f"❌ Could not find location '{location}'. Please check the spelling or try a nearby city."
 
-        lat, lon = loc.latitude, loc.longitude
-        overpass_url = "https://overpass-api.de/api/interpreter"
-        overpass_query = f"""
-        [out:json][timeout:25];
-        (
-          node["name"~"{query}", i](around:{radius},{lat},{lon});
-          node["amenity"~"{query}", i](around:{radius},{lat},{lon});
-          node["shop"~"{query}", i](around:{radius},{lat},{lon});
-        );
-        out body {limit};
-        """
-        response = requests.get(
-            overpass_url, params={"data": overpass_query}, timeout=20
+        # Imported regions are answered from the offline index; only areas
+        # outside them go to Overpass.
+        local = poi_index.search(query, loc.latitude, loc.longitude, radius, limit)
+        if local is not None:
+            return _format_places(query, location, local, limit)
+
+        overpass_query = _overpass_query(query, loc.latitude, loc.longitude, radius)
+        with get_sync_session().get(
+            OVERPASS_URL, params={"data": overpass_query}, timeout=20, stream=True
+        ) as response:
+            if response.status_code != 200:
+                return f"❌ Overpass API error: {response.status_code}. Please try again later."
+            elements = parse_elements(response.iter_content(chunk_size=65536))
+
+        ranked = rank_elements(
+            elements, query, loc.latitude, loc.longitude, radius, limit
         )
-        if response.status_code != 200:
-            return f"❌ Overpass API error: {response.status_code}. Please try again later."
-
-        data = response.json()
-        elements = data.get("elements", [])
-        if not elements:
-            return f"ℹ️ No results found for '{query}' near {location}. Try a different keyword or location."
-
-        output = [
-            f"Top {min(limit, len(elements))} results for '{query}' near {location}:"
-        ]
-        for el in elements[:limit]:
-            name = el.get("tags", {}).get("name", "Unnamed place")
-            street = el.get("tags", {}).get("addr:street", "")
-            city = el.get("tags", {}).get("addr:city", "")
-            country = el.get("tags", {}).get("addr:country", "")
-            lat = el.get("lat", None)
-            lon = el.get("lon", None)
-            full_addr = ", ".join(filter(None, [street, city, country]))
-            coords = f" (Lat: {lat:.5f}, Lon: {lon:.5f})" if lat and lon else ""
-            output.append(
-                f"- {name}{coords} | {full_addr if full_addr else 'Address not available'}"
-            )
-        return "\n".join(output)
+        return _format_places(query, location, ranked, limit)
     except requests.Timeout:
         return "❌ The request to the Overpass API timed out. Please try again."
     except Exception as e:
         return f"❌ Error searching for '{query}' near '{location}': {str(e)}"
 
 
-location_search_tool = FunctionTool(func=find_nearby_places_open)
+async def find_nearby_places_open_async(
+    query: str, location: str, radius: int = 3000, limit: int = 5
+) -> str:
+    """
+    Finds nearby places for any text query using free OpenStreetMap APIs (no API key needed).
+
+    Args:
+        query (str): What you’re looking for (e.g., "restaurant", "hospital", "gym", "bar").
+        location (str): The city or area to search in.
+        radius (int): Search radius in meters (default: 3000).
+        limit (int): Number of results to show (default: 5).
+
+    Returns:
+        str: List of matching place names and addresses, formatted for user display.
+    """
+    from travel_planner.poi_index import poi_index
+    from travel_planner.ranking import parse_elements_async, rank_elements
+
+    try:
+        loc = await geocode_async(location)
+        if not loc:
+            return f"❌ Could not find location '{location}'. Please check the spelling or try a nearby city."
+
+        # Imported regions are answered from the offline index; only areas
+        # outside them go to Overpass.
+        local = poi_index.search(query, loc.latitude, loc.longitude, radius, limit)
+        if local is not None:
+            return _format_places(query, location, local, limit)
+
+        overpass_query = _overpass_query(query, loc.latitude, loc.longitude, radius)
+        async with get_async_client().stream(
+            "GET", OVERPASS_URL, params={"data": overpass_query}, timeout=20
+        ) as response:
+            if response.status_code != 200:
+                return f"❌ Overpass API error: {response.status_code}. Please try again later."
+            elements = await parse_elements_async(response.aiter_bytes())
+
+        ranked = rank_elements(
+            elements, query, loc.latitude, loc.longitude, radius, limit
+        )
+        return _format_places(query, location, ranked, limit)
+    except httpx.TimeoutException:
+        return "❌ The request to the Overpass API timed out. Please try again."
+    except Exception as e:
+        return f"❌ Error searching for '{query}' near '{location}': {str(e)}"
+
+
+location_search_tool = FunctionTool(func=find_nearby_places_open_async)
@@ -0,0 +1,469 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.adk.tools.agent_tool import AgentTool
+
+# --- Tracing ---
+# Spans for agent runs, LLM calls, tool calls (FunctionTool and AgentTool),
+# geocoding and upstream HTTP requests. Parent/child links follow the agent
+# hierarchy through a context variable, so an AgentTool's nested agent and
+# its tools appear under the tool span that invoked it. Spans go to any
+# number of exporters; with none configured, tracing is a cheap no-op.
+
+SPAN_KINDS = ("agent", "llm", "tool", "http", "geocode", "internal")
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    parent: Optional["Span"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# -- exporters --
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list (for tests and benchmarks)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def find(self, name: Optional[str] = None, kind: Optional[str] = None):
+        return [
+            s
+            for s in self.spans
+            if (name is None or s.name == name) and (kind is None or s.kind == kind)
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+_OTLP_KINDS = {"agent": 1, "llm": 3, "tool": 1, "http": 3, "geocode": 3, "internal": 1}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span], service_name: str = "travel_planner") -> Dict:
+    """Encode spans as an OTLP/JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "travel_planner.tracing"},
+                        "spans": [
+                            {
+                                "traceId": s.trace_id,
+                                "spanId": s.span_id,
+                                "parentSpanId": s.parent_id or "",
+                                "name": s.name,
+                                "kind": _OTLP_KINDS.get(s.kind, 1),
+                                "startTimeUnixNano": str(s.start_ns),
+                                "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                                "attributes": [
+                                    {"key": k, "value": _otlp_value(v)}
+                                    for k, v in {
+                                        "span.kind": s.kind,
+                                        **s.attributes,
+                                    }.items()
+                                ],
+                                "status": {"code": 1 if s.status == "ok" else 2},
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class JsonLinesExporter:
+    """
+    Appends one JSON line per finished span.
+    Args:
+        path (str): Output file.
+        format (str): "native" (Span.to_dict) or "otlp" (one OTLP/JSON
+            request per span, loadable by OTLP file receivers).
+    """
+
+    def __init__(self, path: str, format: str = "native"):
+        if format not in ("native", "otlp"):
+            raise ValueError(f"Unknown trace format: {format}")
+        self.path = path
+        self.format = format
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        record = span.to_dict() if self.format == "native" else to_otlp([span])
+        line = json.dumps(record, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# -- tracer --
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "travel_planner_current_span", default=None
+)
+
+
+class Tracer:
+    def __init__(self):
+        self.exporters: List[Any] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: Any) -> None:
+        self.exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Any) -> None:
+        self.exporters.remove(exporter)
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[Span] = None,
+        activate: bool = True,
+        **attributes: Any,
+    ) -> Span:
+        parent = parent if parent is not None else _current_span.get()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+            parent=parent,
+        )
+        if activate:
+            _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, status: Optional[str] = None) -> None:
+        if span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if status:
+            span.status = status
+        # Re-activate the parent by value rather than resetting a token: ADK
+        # may run the matching "after" callback in a different context.
+        if _current_span.get() is span:
+            _current_span.set(span.parent)
+        span.parent = None
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def span(
+        self, name: str, kind: str = "internal", **attributes: Any
+    ) -> Iterator[Optional[Span]]:
+        """Context manager for a span; yields None when tracing is disabled."""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, kind, activate=False, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=repr(e))
+            span.status = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+
+tracer = Tracer()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Attach attributes (e.g. cache="hit") to the active span, if any."""
+    span = _current_span.get()
+    if span is not None and tracer.enabled:
+        span.set(**attributes)
+
+
+def traced(name: Optional[str] = None, kind: str = "internal") -> Callable:
+    """Decorator recording a span around a sync or async function."""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# -- ADK callbacks --
+# Spans opened in a "before" callback are looked up again in the matching
+# "after" callback by these keys.
+
+_open: Dict[Tuple[str, ...], Span] = {}
+
+
+def _open_span(key: Tuple[str, ...], span: Span) -> None:
+    _open[key] = span
+
+
+def _close_span(key: Tuple[str, ...], status: Optional[str] = None) -> Optional[Span]:
+    span = _open.pop(key, None)
+    if span is not None:
+        tracer.end_span(span, status)
+    return span
+
+
+def _before_agent(callback_context: CallbackContext):
+    if tracer.enabled:
+        span = tracer.start_span(
+            callback_context.agent_name,
+            "agent",
+            invocation_id=callback_context.invocation_id,
+            user_id=callback_context.user_id,
+        )
+        _open_span(
+            ("agent", callback_context.invocation_id, callback_context.agent_name), span
+        )
+    return None
+
+
+def _after_agent(callback_context: CallbackContext):
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    # An LLM span stays open if a before_model callback (e.g. the fast path)
+    # answered without calling the model; close it with the agent.
+    _close_span(("llm", *key), "short_circuit")
+    _close_span(("agent", *key))
+    return None
+
+
+def _before_model(callback_context: CallbackContext, llm_request: LlmRequest):
+    if tracer.enabled:
+        span = tracer.start_span(
+            f"llm {llm_request.model or ''}".strip(),
+            "llm",
+            activate=False,
+            agent=callback_context.agent_name,
+            model=llm_request.model,
+            contents=len(llm_request.contents),
+        )
+        _open_span(
+            ("llm", callback_context.invocation_id, callback_context.agent_name), span
+        )
+    return None
+
+
+def _after_model(callback_context: CallbackContext, llm_response: LlmResponse):
+    key = ("llm", callback_context.invocation_id, callback_context.agent_name)
+    span = _open.get(key)
+    if span is not None:
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            span.set(
+                prompt_tokens=usage.prompt_token_count or 0,
+                output_tokens=usage.candidates_token_count or 0,
+                total_tokens=usage.total_token_count or 0,
+                cached_tokens=usage.cached_content_token_count or 0,
+            )
+        if llm_response.partial:
+            return None
+        _close_span(key, "error" if llm_response.error_code else None)
+    return None
+
+
+def _on_model_error(
+    callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+):
+    key = ("llm", callback_context.invocation_id, callback_context.agent_name)
+    span = _open.get(key)
+    if span is not None:
+        span.set(error=repr(error))
+        _close_span(key, "error")
+    return None
+
+
+def _tool_key(tool_context: ToolContext) -> Tuple[str, ...]:
+    return ("tool", tool_context.invocation_id, tool_context.function_call_id or "")
+
+
+def _before_tool(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext):
+    if tracer.enabled:
+        span = tracer.start_span(
+            f"tool {tool.name}",
+            "tool",
+            tool=tool.name,
+            tool_type="agent" if isinstance(tool, AgentTool) else "function",
+            agent=tool_context.agent_name,
+            args=json.dumps(args, default=str)[:500],
+        )
+        _open_span(_tool_key(tool_context), span)
+    return None
+
+
+def _after_tool(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any
+):
+    _close_span(_tool_key(tool_context))
+    return None
+
+
+def _on_tool_error(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, error: Exception
+):
+    span = _open.get(_tool_key(tool_context))
+    if span is not None:
+        span.set(error=repr(error))
+        _close_span(_tool_key(tool_context), "error")
+    return None
+
+
+_CALLBACKS = {
+    "before_agent_callback": _before_agent,
+    "after_agent_callback": _after_agent,
+    "before_model_callback": _before_model,
+    "after_model_callback": _after_model,
+    "on_model_error_callback": _on_model_error,
+    "before_tool_callback": _before_tool,
+    "after_tool_callback": _after_tool,
+    "on_tool_error_callback": _on_tool_error,
+}
+
+
+def _add_callback(agent: BaseAgent, attr: str, callback: Callable) -> None:
+    existing = getattr(agent, attr)
+    if existing is None:
+        callbacks = []
+    elif isinstance(existing, list):
+        callbacks = list(existing)
+    else:
+        callbacks = [existing]
+    if callback in callbacks:
+        return
+    # Tracing goes first so its "before" hooks run even when a later
+    # callback short-circuits the model or tool call.
+    setattr(agent, attr, [callback, *callbacks])
+
+
+def instrument_agent(agent: BaseAgent) -> None:
+    """Attach tracing callbacks to one agent (idempotent)."""
+    for attr, callback in _CALLBACKS.items():
+        # Model and tool callbacks only exist on LlmAgent.
+        if hasattr(agent, attr):
+            _add_callback(agent, attr, callback)
+
+
+def instrument_agent_tree(root: BaseAgent) -> None:
+    """
+    Instrument ``root``, its sub-agents and every agent wrapped in an
+    AgentTool anywhere below it.
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        agent = stack.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        instrument_agent(agent)
+        stack.extend(agent.sub_agents)
+        for tool in getattr(agent, "tools", ()):
+            if isinstance(tool, AgentTool):
+                stack.append(tool.agent)
+
+
+def configure_from_env() -> None:
+    """Enable the JSON-lines exporter when TRAVEL_TRACE_FILE is set."""
+    path = os.environ.get("TRAVEL_TRACE_FILE")
+    if path:
+        tracer.add_exporter(
+            JsonLinesExporter(path, os.environ.get("TRAVEL_TRACE_FORMAT", "native"))
+        )
+
+
+configure_from_env()
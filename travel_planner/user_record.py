@@ -0,0 +1,192 @@
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+# --- Compact User Records ---
+# One UserRecord is kept per known user, so the layout matters: __slots__
+# dataclasses instead of nested dicts, enum singletons (or interned strings)
+# for the small closed vocabularies, tuples for activities, and containers
+# that are only allocated once something is written to them.
+
+
+class Budget(str, Enum):
+    LOW = "low"
+    MID = "mid"
+    HIGH = "high"
+
+
+class Style(str, Enum):
+    RELAXATION = "relaxation"
+    ADVENTURE = "adventure"
+    FAMILY = "family"
+
+
+class AgeGroup(str, Enum):
+    AGE_18_25 = "18-25"
+    AGE_26_40 = "26-40"
+    AGE_41_60 = "41-60"
+    AGE_60_PLUS = "60+"
+
+
+_ALIASES: Dict[Type[Enum], Dict[str, Enum]] = {
+    Budget: {
+        "budget": Budget.LOW,
+        "cheap": Budget.LOW,
+        "medium": Budget.MID,
+        "moderate": Budget.MID,
+        "middle": Budget.MID,
+        "luxury": Budget.HIGH,
+        "premium": Budget.HIGH,
+    },
+    Style: {"relaxed": Style.RELAXATION, "relax": Style.RELAXATION},
+    AgeGroup: {"61+": AgeGroup.AGE_60_PLUS, "60 plus": AgeGroup.AGE_60_PLUS},
+}
+
+EnumValue = Union[Enum, str, None]
+
+
+def _coerce(enum_cls: Type[Enum], value: Any) -> EnumValue:
+    """
+    Map a free-text value onto the enum singleton when it is a known value
+    or alias; anything else is kept as an interned string.
+    """
+    if value is None or isinstance(value, enum_cls):
+        return value
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    try:
+        return enum_cls(text)
+    except ValueError:
+        pass
+    alias = _ALIASES.get(enum_cls, {}).get(text)
+    return alias if alias is not None else sys.intern(text)
+
+
+def _value(v: EnumValue) -> Optional[str]:
+    return v.value if isinstance(v, Enum) else v
+
+
+def _activities(value: Any) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(sys.intern(str(a).strip().lower()) for a in value if str(a).strip())
+
+
+@dataclass(slots=True)
+class Profile:
+    activities: Tuple[str, ...] = ()  # e.g., ("adventure", "culture", "food")
+    budget: EnumValue = None  # Budget.LOW / MID / HIGH
+    style: EnumValue = None  # Style.RELAXATION / ADVENTURE / FAMILY
+    age_group: EnumValue = None  # AgeGroup.AGE_18_25, ...
+    extra: Optional[Dict[str, Any]] = None  # fields outside the fixed schema
+
+    def update(self, updates: Dict[str, Any]) -> None:
+        for key, value in updates.items():
+            if key == "activities":
+                self.activities = _activities(value)
+            elif key == "budget":
+                self.budget = _coerce(Budget, value)
+            elif key == "style":
+                self.style = _coerce(Style, value)
+            elif key == "age_group":
+                self.age_group = _coerce(AgeGroup, value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[sys.intern(key)] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "activities": list(self.activities),
+            "budget": _value(self.budget),
+            "style": _value(self.style),
+            "age_group": _value(self.age_group),
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Profile":
+        profile = cls()
+        profile.update(data)
+        return profile
+
+
+@dataclass(slots=True)
+class UserRecord:
+    profile: Profile
+    preferences: Optional[Dict[str, Any]] = None
+    history: Optional[List[str]] = None
+    feedback: Optional[List[str]] = None
+
+    def update_preferences(self, preferences: Dict[str, Any]) -> None:
+        if self.preferences is None:
+            self.preferences = {}
+        self.preferences.update(preferences)
+
+    def append_history(self, query: str, limit: int) -> None:
+        if self.history is None:
+            self.history = []
+        _append_bounded(self.history, query, limit)
+
+    def append_feedback(self, feedback: str, limit: int) -> None:
+        if self.feedback is None:
+            self.feedback = []
+        _append_bounded(self.feedback, feedback, limit)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.to_dict(),
+            "preferences": dict(self.preferences or {}),
+            "history": list(self.history or ()),
+            "feedback": list(self.feedback or ()),
+        }
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by this record (enum singletons excluded)."""
+        return _deep_sizeof(self, set())
+
+
+def _append_bounded(items: List[str], item: str, limit: int) -> None:
+    items.append(item)
+    if len(items) > limit:
+        del items[: len(items) - limit]
+
+
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    # Enum members are process-wide singletons and are not charged to any
+    # record; other objects are counted once per walk.
+    if obj is None or isinstance(obj, (Enum, bool)) or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            _deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__)
+    return size
+
+
+def memory_report(records: Iterable[UserRecord]) -> Dict[str, Any]:
+    """
+    Summarize the memory held by a set of user records.
+    Returns:
+        dict: users, total_bytes, bytes_per_user (mean) and max_user_bytes.
+    """
+    sizes = [record.memory_size() for record in records]
+    total = sum(sizes)
+    return {
+        "users": len(sizes),
+        "total_bytes": total,
+        "bytes_per_user": total / len(sizes) if sizes else 0.0,
+        "max_user_bytes": max(sizes, default=0),
+    }
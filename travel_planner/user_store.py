@@ -0,0 +1,352 @@
+import atexit
+import json
+import sqlite3
+import threading
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from travel_planner.user_record import Profile, UserRecord, memory_report
+
+# --- User Context Storage Backends ---
+# UserContextMemory delegates persistence to one of these stores. Both keep
+# history and feedback bounded (oldest entries are dropped) and serialize
+# writes per user; the SQLite store additionally survives restarts and can be
+# shared by several worker processes.
+
+DEFAULT_MAX_HISTORY = 200
+DEFAULT_MAX_FEEDBACK = 100
+_LOCK_STRIPES = 64
+
+
+class _StripedLocks:
+    """Fixed pool of locks indexed by user id, so memory stays flat."""
+
+    def __init__(self, stripes: int = _LOCK_STRIPES):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def __call__(self, user_id: str) -> threading.RLock:
+        return self._locks[hash(user_id) % len(self._locks)]
+
+
+class UserStore(ABC):
+    """
+    Storage interface for per-user context.
+    Args:
+        max_history (int): History entries retained per user.
+        max_feedback (int): Feedback entries retained per user.
+    """
+
+    def __init__(
+        self,
+        max_history: int = DEFAULT_MAX_HISTORY,
+        max_feedback: int = DEFAULT_MAX_FEEDBACK,
+    ):
+        self.max_history = max_history
+        self.max_feedback = max_feedback
+        self.user_lock = _StripedLocks()
+
+    @abstractmethod
+    def load(self, user_id: str) -> UserRecord:
+        """Return one user's record (defaults if unknown). Treat as read-only."""
+
+    @abstractmethod
+    def update_profile(self, user_id: str, updates: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def update_preferences(self, user_id: str, preferences: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def append_history(self, user_id: str, query: str) -> None: ...
+
+    @abstractmethod
+    def append_feedback(self, user_id: str, feedback: str) -> None: ...
+
+    def flush(self) -> None:
+        """Persist buffered writes (no-op for unbuffered stores)."""
+
+    def close(self) -> None:
+        self.flush()
+
+    @abstractmethod
+    def memory_report(self) -> Dict[str, Any]:
+        """Report the memory (or storage) footprint of the stored users."""
+
+
+class InMemoryUserStore(UserStore):
+    """Process-local store of compact UserRecords with bounded history/feedback."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._users: Dict[str, UserRecord] = {}
+
+    def _record(self, user_id: str) -> UserRecord:
+        record = self._users.get(user_id)
+        if record is None:
+            record = self._users[user_id] = UserRecord(Profile())
+        return record
+
+    def load(self, user_id: str) -> UserRecord:
+        # Existing users are returned as-is: no copy, no default structure.
+        record = self._users.get(user_id)
+        if record is not None:
+            return record
+        with self.user_lock(user_id):
+            return self._record(user_id)
+
+    def update_profile(self, user_id: str, updates: Dict[str, Any]) -> None:
+        with self.user_lock(user_id):
+            self._record(user_id).profile.update(updates)
+
+    def update_preferences(self, user_id: str, preferences: Dict[str, Any]) -> None:
+        with self.user_lock(user_id):
+            self._record(user_id).update_preferences(preferences)
+
+    def append_history(self, user_id: str, query: str) -> None:
+        with self.user_lock(user_id):
+            self._record(user_id).append_history(query, self.max_history)
+
+    def append_feedback(self, user_id: str, feedback: str) -> None:
+        with self.user_lock(user_id):
+            self._record(user_id).append_feedback(feedback, self.max_feedback)
+
+    def memory_report(self) -> Dict[str, Any]:
+        report = memory_report(list(self._users.values()))
+        report["index_bytes"] = sys.getsizeof(self._users) + sum(
+            sys.getsizeof(k) for k in list(self._users)
+        )
+        return report
+
+
+class SQLiteUserStore(UserStore):
+    """
+    SQLite (WAL mode) store shared by every worker pointing at the same file.
+    Writes are buffered and committed in batches of ``batch_size`` or every
+    ``flush_interval`` seconds (a background thread flushes idle buffers, so
+    other workers see them); a user's pending writes are flushed before that
+    user is read. A batch whose transaction fails is put back and retried.
+    History/feedback beyond the retention limits are compacted away at
+    flush time.
+    Args:
+        path (str): SQLite database file.
+        batch_size (int): Buffered writes that trigger a flush.
+        flush_interval (float): Max seconds a write stays buffered.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db_lock = threading.Lock()
+        self._pending: List[Tuple[str, str, Any]] = []
+        self._pending_lock = threading.Lock()
+        self._oldest_pending: Optional[float] = None
+        self.last_flush_error: Optional[str] = None
+        self._closed = threading.Event()
+        self._wake = threading.Event()
+        with self._db_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id TEXT PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    preferences TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS user_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS user_items_by_user
+                    ON user_items (user_id, kind, id);
+                """)
+        atexit.register(self.close)
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="user-store-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.is_set():
+            with self._pending_lock:
+                oldest = self._oldest_pending
+            if oldest is None:
+                # Idle until the next write (or close) arrives.
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            delay = oldest + self.flush_interval - time.monotonic()
+            if delay > 0:
+                self._closed.wait(delay)
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                # The batch was re-queued; retry after another interval.
+                self.last_flush_error = str(e)
+                self._closed.wait(self.flush_interval)
+
+    # -- writes --
+
+    def _enqueue(self, op: str, user_id: str, value: Any) -> None:
+        with self._pending_lock:
+            self._pending.append((op, user_id, value))
+            if self._oldest_pending is None:
+                self._oldest_pending = time.monotonic()
+                self._wake.set()
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._oldest_pending >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def update_profile(self, user_id: str, updates: Dict[str, Any]) -> None:
+        self._enqueue("profile", user_id, dict(updates))
+
+    def update_preferences(self, user_id: str, preferences: Dict[str, Any]) -> None:
+        self._enqueue("preferences", user_id, dict(preferences))
+
+    def append_history(self, user_id: str, query: str) -> None:
+        self._enqueue("history", user_id, query)
+
+    def append_feedback(self, user_id: str, feedback: str) -> None:
+        self._enqueue("feedback", user_id, feedback)
+
+    def flush(self) -> None:
+        # The batch is taken under the DB lock so readers never observe the
+        # window between a batch leaving the buffer and being committed.
+        with self._db_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                oldest, self._oldest_pending = self._oldest_pending, None
+            if not batch:
+                return
+            now = time.time()
+            touched = set()
+            # BEGIN IMMEDIATE takes the write lock up front, so profile
+            # read-merge-write cycles from other processes cannot interleave.
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                for op, user_id, value in batch:
+                    if op in ("profile", "preferences"):
+                        self._merge_json(user_id, op, value, now)
+                    else:
+                        self._conn.execute(
+                            "INSERT INTO user_items (user_id, kind, value, created_at)"
+                            " VALUES (?, ?, ?, ?)",
+                            (user_id, op, json.dumps(value), now),
+                        )
+                        touched.add((user_id, op))
+                for user_id, kind in touched:
+                    self._compact(user_id, kind)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                # Put the batch back ahead of newer writes so nothing is lost
+                # and per-user order is preserved.
+                with self._pending_lock:
+                    self._pending[:0] = batch
+                    self._oldest_pending = oldest
+                self._wake.set()
+                raise
+            self.last_flush_error = None
+
+    def _merge_json(self, user_id: str, column: str, value: Dict, now: float) -> None:
+        row = self._conn.execute(
+            "SELECT profile, preferences FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            profile, preferences = Profile(), {}
+        else:
+            profile, preferences = Profile.from_dict(json.loads(row[0])), json.loads(
+                row[1]
+            )
+        if column == "profile":
+            profile.update(value)
+        else:
+            preferences.update(value)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+            (user_id, json.dumps(profile.to_dict()), json.dumps(preferences), now),
+        )
+
+    def _compact(self, user_id: str, kind: str) -> None:
+        keep = self.max_history if kind == "history" else self.max_feedback
+        self._conn.execute(
+            "DELETE FROM user_items WHERE user_id = ? AND kind = ? AND id <= ("
+            " SELECT id FROM user_items WHERE user_id = ? AND kind = ?"
+            " ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (user_id, kind, user_id, kind, keep),
+        )
+
+    # -- reads --
+
+    def load(self, user_id: str) -> UserRecord:
+        with self._pending_lock:
+            has_pending = any(uid == user_id for _, uid, _ in self._pending)
+        if has_pending:
+            self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT profile, preferences FROM users WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            items = self._conn.execute(
+                "SELECT kind, value FROM user_items WHERE user_id = ? ORDER BY id",
+                (user_id,),
+            ).fetchall()
+        record = UserRecord(
+            Profile.from_dict(json.loads(row[0])) if row else Profile(),
+            preferences=json.loads(row[1]) or None if row else None,
+        )
+        for kind, value in items:
+            if kind == "history":
+                record.append_history(json.loads(value), self.max_history)
+            else:
+                record.append_feedback(json.loads(value), self.max_feedback)
+        return record
+
+    def memory_report(self) -> Dict[str, Any]:
+        # Records are loaded on demand, so only the database and the write
+        # buffer are resident; report those instead of per-record sizes.
+        with self._db_lock:
+            users = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        with self._pending_lock:
+            pending = len(self._pending)
+        db_bytes = page_count * page_size
+        return {
+            "users": users,
+            "db_bytes": db_bytes,
+            "bytes_per_user": db_bytes / users if users else 0.0,
+            "pending_writes": pending,
+        }
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+        atexit.unregister(self.close)
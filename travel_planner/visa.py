@@ -0,0 +1,248 @@
+import csv
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from travel_planner.geocoding import normalize_location
+
+# --- Visa Rules Store ---
+# The full passport x destination matrix is held as dense int8/int16 arrays
+# indexed by country position, so a lookup is two dict hits (name -> index)
+# and one array read. Rules are loaded from CSV files under data/ and
+# reloaded in place when any of them changes on disk.
+
+DATA_DIR = Path(__file__).parent / "data"
+COUNTRIES_PATH = os.environ.get("TRAVEL_COUNTRIES", str(DATA_DIR / "countries.csv"))
+GROUPS_PATH = os.environ.get(
+    "TRAVEL_COUNTRY_GROUPS", str(DATA_DIR / "country_groups.csv")
+)
+VISA_RULES_PATH = os.environ.get("TRAVEL_VISA_RULES", str(DATA_DIR / "visa_rules.csv"))
+RELOAD_CHECK_SECONDS = float(os.environ.get("TRAVEL_VISA_RELOAD_CHECK", 5))
+
+# Ordered from least to most paperwork.
+REQUIREMENTS = (
+    "unknown",
+    "citizen",
+    "visa_free",
+    "visa_on_arrival",
+    "eta",
+    "e_visa",
+    "visa_required",
+)
+UNKNOWN = REQUIREMENTS.index("unknown")
+CITIZEN = REQUIREMENTS.index("citizen")
+
+
+@dataclass(frozen=True)
+class Country:
+    code: str  # ISO 3166-1 alpha-2
+    name: str
+    demonym: str
+
+
+@dataclass(frozen=True)
+class VisaRule:
+    passport: Country
+    destination: Country
+    requirement: str
+    max_stay_days: int  # 0 = no fixed limit
+    note: str
+
+
+def _rows(path: str) -> Iterator[Dict[str, str]]:
+    """CSV rows as dicts, skipping blank lines and ``#`` comments."""
+    with open(path, encoding="utf-8", newline="") as f:
+        lines = (line for line in f if line.strip() and not line.startswith("#"))
+        yield from csv.DictReader(lines)
+
+
+class VisaRules:
+    """
+    One immutable snapshot of the rules.
+    Args:
+        countries (list): Country per matrix index.
+        aliases (dict): Normalized name/code/demonym -> index.
+        requirement (np.ndarray): (N, N) int8 index into REQUIREMENTS.
+        max_stay (np.ndarray): (N, N) int16 days.
+        note_index (np.ndarray): (N, N) int16 index into ``notes``.
+        notes (list): Distinct rule notes ("" first).
+    """
+
+    def __init__(
+        self,
+        countries: List[Country],
+        aliases: Dict[str, int],
+        requirement: np.ndarray,
+        max_stay: np.ndarray,
+        note_index: np.ndarray,
+        notes: List[str],
+    ):
+        self.countries = countries
+        self.aliases = aliases
+        self.requirement = requirement
+        self.max_stay = max_stay
+        self.note_index = note_index
+        self.notes = notes
+
+    @classmethod
+    def load(cls, countries_path: str, groups_path: str, rules_path: str):
+        countries: List[Country] = []
+        aliases: Dict[str, int] = {}
+        for i, row in enumerate(_rows(countries_path)):
+            country = Country(row["iso2"].upper(), row["name"], row["demonym"])
+            countries.append(country)
+            names = [row["iso2"], row["iso3"], row["name"], row["demonym"]]
+            names += row["aliases"].split(";")
+            for name in names:
+                key = normalize_location(name)
+                if key:
+                    aliases.setdefault(key, i)
+        codes = {c.code: i for i, c in enumerate(countries)}
+        groups = {
+            row["group"]: [codes[m] for m in row["members"].split()]
+            for row in _rows(groups_path)
+        }
+
+        def expand(ref: str) -> List[int]:
+            ref = ref.strip()
+            try:
+                return groups[ref[1:]] if ref.startswith("@") else [codes[ref.upper()]]
+            except KeyError:
+                raise ValueError(f"Unknown country code or group '{ref}'") from None
+
+        n = len(countries)
+        requirement = np.full((n, n), UNKNOWN, np.int8)
+        max_stay = np.zeros((n, n), np.int16)
+        note_index = np.zeros((n, n), np.int16)
+        notes = [""]
+        for row in _rows(rules_path):
+            passports = np.array(expand(row["passport"]), np.intp)
+            destinations = np.array(expand(row["destination"]), np.intp)
+            cells = np.ix_(passports, destinations)
+            requirement[cells] = REQUIREMENTS.index(row["requirement"].strip())
+            max_stay[cells] = int(row["max_stay_days"] or 0)
+            note = row["note"].strip()
+            if note not in notes:
+                notes.append(note)
+            note_index[cells] = notes.index(note)
+        home = np.arange(n)
+        requirement[home, home] = CITIZEN
+        max_stay[home, home] = 0
+        note_index[home, home] = 0
+        return cls(countries, aliases, requirement, max_stay, note_index, notes)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Matrix index for a country name, ISO code or demonym."""
+        key = normalize_location(name)
+        index = self.aliases.get(key)
+        if index is None and key.endswith(("citizen", "citizens")):
+            key = key.rsplit(" ", 1)[0]
+            index = self.aliases.get(key)
+        if index is None and key.endswith("s"):
+            index = self.aliases.get(key[:-1])  # "Germans", "Indians"
+        return index
+
+    def _rule(self, i: int, j: int) -> VisaRule:
+        return VisaRule(
+            self.countries[i],
+            self.countries[j],
+            REQUIREMENTS[self.requirement[i, j]],
+            int(self.max_stay[i, j]),
+            self.notes[self.note_index[i, j]],
+        )
+
+    def lookup(self, nationality: str, destination: str) -> Optional[VisaRule]:
+        """Rule for one pair, or None if either country is not recognised."""
+        i, j = self.resolve(nationality), self.resolve(destination)
+        if i is None or j is None:
+            return None
+        return self._rule(i, j)
+
+    def destinations(
+        self, nationality: str, requirements: Sequence[str] = ("visa_free",)
+    ) -> Optional[List[VisaRule]]:
+        """
+        Every destination whose requirement for this passport is one of
+        ``requirements``, longest allowed stay first (unlimited first).
+        Returns None if the nationality is not recognised.
+        """
+        i = self.resolve(nationality)
+        if i is None:
+            return None
+        wanted = [REQUIREMENTS.index(r) for r in requirements]
+        matches = np.flatnonzero(np.isin(self.requirement[i], wanted))
+        matches = matches[matches != i]
+        stay = self.max_stay[i, matches].astype(np.int32)
+        order = np.lexsort(
+            (matches, np.where(stay == 0, np.iinfo(np.int32).min, -stay))
+        )
+        return [self._rule(i, int(j)) for j in matches[order]]
+
+    def unknown_destinations(self, nationality: str) -> Optional[int]:
+        """
+        How many destinations have no rule on file for this passport, or
+        None if the nationality is not recognised.
+        """
+        i = self.resolve(nationality)
+        if i is None:
+            return None
+        return int(np.count_nonzero(self.requirement[i] == UNKNOWN))
+
+
+class VisaRuleStore:
+    """
+    Serves the current VisaRules and reloads them when a data file changes.
+    Args:
+        paths (tuple): Countries, groups and rules CSV paths.
+        check_interval (float): Min seconds between file mtime checks.
+    """
+
+    def __init__(
+        self,
+        paths: Tuple[str, str, str] = (COUNTRIES_PATH, GROUPS_PATH, VISA_RULES_PATH),
+        check_interval: float = RELOAD_CHECK_SECONDS,
+    ):
+        self.paths = paths
+        self.check_interval = check_interval
+        self._rules: Optional[VisaRules] = None
+        self._mtimes: Tuple[float, ...] = ()
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _stat(self) -> Tuple[float, ...]:
+        return tuple(os.stat(p).st_mtime_ns for p in self.paths)
+
+    def rules(self) -> VisaRules:
+        """The current snapshot; loads on first use and after file changes."""
+        now = time.monotonic()
+        if self._rules is not None and now - self._checked_at < self.check_interval:
+            return self._rules
+        with self._lock:
+            if self._rules is None or now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                try:
+                    mtimes = self._stat()
+                    if mtimes != self._mtimes:
+                        # Remember the attempt so a broken file is parsed
+                        # once, not on every check until it is fixed.
+                        self._mtimes = mtimes
+                        self._rules = VisaRules.load(*self.paths)
+                        self.reloads += 1
+                        self.last_error = None
+                except (OSError, KeyError, ValueError) as e:
+                    # Keep serving the last good rules if an edit is broken.
+                    self.last_error = str(e)
+                    if self._rules is None:
+                        self._mtimes = ()
+                        raise
+        return self._rules
+
+
+visa_rules = VisaRuleStore()
@@ -0,0 +1,137 @@
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from travel_planner.cache import TTLCache
+from travel_planner.tracing import annotate
+
+# --- Forecast Cache ---
+# Open-Meteo forecasts only change when the upstream models run, so a fetch
+# stays valid until the next model update. We always fetch the full horizon
+# and keep one row per local calendar day, which lets any later request for
+# 1..FORECAST_HORIZON_DAYS days at the same place be served from memory.
+
+FORECAST_HORIZON_DAYS = 16  # Open-Meteo's maximum forecast_days
+COORD_PRECISION = 2  # ~1 km; nearby geocodes share an entry
+MODEL_UPDATE_HOURS = int(os.environ.get("TRAVEL_FORECAST_UPDATE_HOURS", 6))
+# Model runs at 00/06/12/18 UTC become available roughly an hour later.
+MODEL_AVAILABILITY_LAG = timedelta(
+    minutes=int(os.environ.get("TRAVEL_FORECAST_LAG_MINUTES", 60))
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DayForecast:
+    day: date
+    temp_max: Optional[float]
+    temp_min: Optional[float]
+    precipitation: Optional[float]
+    weathercode: Optional[int]
+
+
+@dataclass(slots=True)
+class _Entry:
+    rows: Dict[date, DayForecast]
+    utc_offset_seconds: int
+
+
+def coord_key(lat: float, lon: float) -> Tuple[float, float]:
+    return (round(lat, COORD_PRECISION), round(lon, COORD_PRECISION))
+
+
+def next_model_update(now: datetime) -> datetime:
+    """Return the first model-availability time strictly after ``now`` (UTC)."""
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    step = timedelta(hours=MODEL_UPDATE_HOURS)
+    candidate = day_start - step + MODEL_AVAILABILITY_LAG
+    while candidate <= now:
+        candidate += step
+    return candidate
+
+
+def _column(values: List[Any], i: int) -> Any:
+    return values[i] if i < len(values) else None
+
+
+def parse_daily(payload: Dict[str, Any]) -> List[DayForecast]:
+    """Turn an Open-Meteo ``daily`` block into per-day rows."""
+    daily = payload.get("daily") or {}
+    days = daily.get("time", [])
+    temps_max = daily.get("temperature_2m_max", [])
+    temps_min = daily.get("temperature_2m_min", [])
+    precip = daily.get("precipitation_sum", [])
+    codes = daily.get("weathercode", [])
+    return [
+        DayForecast(
+            date.fromisoformat(day),
+            _column(temps_max, i),
+            _column(temps_min, i),
+            _column(precip, i),
+            _column(codes, i),
+        )
+        for i, day in enumerate(days)
+    ]
+
+
+class ForecastCache:
+    """
+    Per-location cache of daily forecast rows.
+    Args:
+        maxsize (int): Max locations held (LRU-evicted).
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self._entries = TTLCache(maxsize=maxsize, ttl=MODEL_UPDATE_HOURS * 3600)
+
+    def get(
+        self, lat: float, lon: float, days: int, now: Optional[datetime] = None
+    ) -> Optional[List[DayForecast]]:
+        """
+        Return ``days`` consecutive rows starting at the location's local
+        today, or None if the location is not cached or the range is not
+        fully covered.
+        """
+        entry = self._entries.get(coord_key(lat, lon))
+        if entry is None:
+            annotate(forecast_cache="miss")
+            return None
+        now = now or datetime.now(timezone.utc)
+        today = (now + timedelta(seconds=entry.utc_offset_seconds)).date()
+        rows = []
+        for offset in range(days):
+            row = entry.rows.get(today + timedelta(days=offset))
+            if row is None:
+                annotate(forecast_cache="partial")
+                return None
+            rows.append(row)
+        annotate(forecast_cache="hit")
+        return rows
+
+    def put(
+        self,
+        lat: float,
+        lon: float,
+        payload: Dict[str, Any],
+        now: Optional[datetime] = None,
+    ) -> List[DayForecast]:
+        """Store a forecast response; expires at the next model update."""
+        rows = parse_daily(payload)
+        if rows:
+            now = now or datetime.now(timezone.utc)
+            ttl = (next_model_update(now) - now).total_seconds()
+            entry = _Entry(
+                {row.day: row for row in rows},
+                int(payload.get("utc_offset_seconds") or 0),
+            )
+            self._entries.set(coord_key(lat, lon), entry, ttl=ttl)
+        return rows
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._entries.stats()
+
+
+forecast_cache = ForecastCache()